@@ -9,6 +9,7 @@ from typing import (
     Tuple, Union, Optional, Callable, Dict, NamedTuple, List, TYPE_CHECKING
 )
 import os
+import sys
 from contextlib import contextmanager
 
 from acaciamc.ast import ModuleMeta
@@ -204,7 +205,7 @@ class Compiler:
                 '## Usage: Initialize Acacia, only need to be ran ONCE',
                 '## Execute this before running anything from Acacia!!!'
             )
-            init_file.extend(init)
+            init_file.extend_commands(init)
         else:
             self.file_main.commands[:0] = init
         ## comment on main.mcfunction
@@ -292,7 +293,7 @@ class Compiler:
     def allocate_entity_tag(self) -> str:
         """Return a new entity tag."""
         self._entity_tag_max += 1
-        return self.cfg.entity_tag + str(self._entity_tag_max)
+        return sys.intern(self.cfg.entity_tag + str(self._entity_tag_max))
 
     def allocate_etemplate_id(self) -> int:
         """Return a new entity template id."""
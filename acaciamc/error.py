@@ -189,14 +189,11 @@ class Error(Exception):
     def add_frame(self, frame: ErrFrame):
         self.frames.append(frame)
 
-def traced_call(
-    func: Callable, location: Union[SourceLocation, str, None],
-    source: Optional[SourceLocation], func_repr: str,
-    *args, **kwds
-):
-    try:
-        return func(*args, **kwds)
-    except Error as err:
+    def add_call_frame(self, location: Union[SourceLocation, str, None],
+                       source: Optional[SourceLocation], func_repr: str):
+        """Add a frame saying that the error happened when calling
+        `func_repr` (defined at `source`) at `location`.
+        """
         if location is None:
             location = SourceLocation()
         elif isinstance(location, str):
@@ -205,5 +202,15 @@ def traced_call(
             note = localize("error.tracedcall.note") % source
         else:
             note = None
-        err.add_frame(ErrFrame(location, localize("error.tracedcall.calling") % func_repr, note))
+        self.add_frame(ErrFrame(location, localize("error.tracedcall.calling") % func_repr, note))
+
+def traced_call(
+    func: Callable, location: Union[SourceLocation, str, None],
+    source: Optional[SourceLocation], func_repr: str,
+    *args, **kwds
+):
+    try:
+        return func(*args, **kwds)
+    except Error as err:
+        err.add_call_frame(location, source, func_repr)
         raise
@@ -2,47 +2,96 @@
 
 from abc import ABCMeta, abstractmethod
 from enum import Enum
-from typing import List, NamedTuple, Optional, Union, Iterable, Callable, Dict
+from typing import (
+    List, Optional, Union, Iterable, Callable, Dict, Set
+)
 import json
-
-_TERMINATOR_CHARS = frozenset(" ,@~^/$&\"'!#%+*=[{]}\\|<>`\n")
+import re
+import sys
+
+# Encodes a str as a JSON string literal, like `json.dumps` does
+_encode_json_str = json.encoder.encode_basestring_ascii
+# Matches any character that terminates a bare word in commands
+_TERMINATOR_RE = re.compile(r"[ ,@~^/$&\"'!#%+*=\[{\]}\\|<>`\n]")
+
+# Commands that must be created using their dedicated classes
+_SPECIAL_CMDS = frozenset((
+    "scoreboard", "schedule", "execute", "function", "tellraw", "titleraw"
+))
+# Valid arguments for some commands
+_DISPLAY_LOCATIONS = frozenset(("sidebar", "list", "belowname"))
+_EXECUTE_ENVS = frozenset((
+    "align", "anchored", "as", "at", "facing", "in", "positioned", "rotated"
+))
+_EXECUTE_CONDS = frozenset(("entity", "block", "blocks"))
 
 def mc_str(s: str) -> str:
     if not s:
         return '""'
-    if any(char in _TERMINATOR_CHARS for char in s):
-        return '"%s"' % "".join(
-            "\\\\" if char == "\\" else
-            "\\\"" if char == '"' else
-            char
-            for char in s
-        )
-    else:
+    if _TERMINATOR_RE.search(s) is None:
         return s
+    return '"%s"' % s.replace("\\", "\\\\").replace('"', '\\"')
 
 def mc_selector(s: str) -> str:
-    if s.startswith("@"):
+    if s[:1] == "@":
         return s
-    else:
-        return mc_str(s)
+    return mc_str(s)
 
 def mc_wc_selector(s: str) -> str:
-    if s == "*":
+    if s == "*" or s[:1] == "@":
         return s
-    else:
-        return mc_selector(s)
+    return mc_str(s)
 
-class ScbSlot(NamedTuple):
-    target: str
-    objective: str
+class ScbSlot:
+    """Score of `target` on objective `objective`.
+    Slots are used as dict keys and compared very often, so the hash
+    is computed once here. The command string is built on first use.
+    """
+    __slots__ = ("target", "objective", "_hash", "_str")
 
-    def to_str(self) -> str:
-        return "%s %s" % (
-            mc_wc_selector(self.target),
-            mc_str(self.objective)
+    def __init__(self, target: str, objective: str):
+        self.target = target
+        self.objective = objective
+        self._hash = hash((target, objective))
+        self._str: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return "ScbSlot(target=%r, objective=%r)" % (
+            self.target, self.objective
         )
 
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, ScbSlot):
+            return NotImplemented
+        return (self._hash == other._hash
+                and self.target == other.target
+                and self.objective == other.objective)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def to_str(self) -> str:
+        res = self._str
+        if res is None:
+            res = self._str = (f"{mc_wc_selector(self.target)} "
+                               f"{mc_str(self.objective)}")
+        return res
+
+def _cached_resolve(func: Callable[["Command"], str]):
+    # Decorator for `resolve` of commands whose output only depends
+    # on fields that are never changed after construction.
+    def _wrapped(self: "Command") -> str:
+        try:
+            return self._resolved
+        except AttributeError:
+            res = self._resolved = func(self)
+            return res
+    return _wrapped
+
 class Command(metaclass=ABCMeta):
+    __slots__ = ("_resolved",)
 
     is_debug = False  # only write when -d is set
 
@@ -65,16 +114,15 @@ class Command(metaclass=ABCMeta):
         return "<%s %r>" % (type(self).__name__, self.resolve())
 
 class Cmd(Command):
+    __slots__ = ("value",)
+
     def __init__(self, cmd: str, suppress_special_cmd=False):
         self.value = cmd
         # Read command name
         if cmd and not suppress_special_cmd:
-            for i, char in enumerate(cmd):
-                if char in _TERMINATOR_CHARS:
-                    break
-            name = cmd[:i]
-            if name in ("scoreboard", "schedule", "execute", "function",
-                        "tellraw", "titleraw"):
+            m = _TERMINATOR_RE.search(cmd)
+            name = cmd if m is None else cmd[:m.start()]
+            if name in _SPECIAL_CMDS:
                 raise ValueError(
                     "/%s command need to be invoked by special class" % name
                 )
@@ -83,45 +131,50 @@ class Cmd(Command):
         return self.value
 
 class ScbSetConst(Command):
+    __slots__ = ("target", "value")
+
     def __init__(self, target: ScbSlot, value: int):
         self.target = target
         self.value = value
 
+    @_cached_resolve
     def resolve(self) -> str:
-        return "scoreboard players set %s %d" % (
-            self.target.to_str(), self.value
-        )
+        return f"scoreboard players set {self.target.to_str()} {self.value}"
 
     def scb_did_assign(self, slot: ScbSlot) -> bool:
         return slot == self.target
 
 class ScbAddConst(Command):
+    __slots__ = ("target", "value")
+
     def __init__(self, target: ScbSlot, value: int):
         self.target = target
         self.value = value
 
+    @_cached_resolve
     def resolve(self) -> str:
-        return "scoreboard players add %s %d" % (
-            self.target.to_str(), self.value
-        )
+        return f"scoreboard players add {self.target.to_str()} {self.value}"
 
     def scb_did_assign(self, slot: ScbSlot) -> bool:
         return slot == self.target
 
 class ScbRemoveConst(Command):
+    __slots__ = ("target", "value")
+
     def __init__(self, target: ScbSlot, value: int):
         self.target = target
         self.value = value
 
+    @_cached_resolve
     def resolve(self) -> str:
-        return "scoreboard players remove %s %d" % (
-            self.target.to_str(), self.value
-        )
+        return (f"scoreboard players remove {self.target.to_str()} "
+                f"{self.value}")
 
     def scb_did_assign(self, slot: ScbSlot) -> bool:
         return slot == self.target
 
-class ScbOp(Enum):
+class ScbOp(str, Enum):
+    # Mixing in `str` lets members be concatenated directly
     ADD_EQ = "+="
     SUB_EQ = "-="
     MUL_EQ = "*="
@@ -133,17 +186,17 @@ class ScbOp(Enum):
     ASSIGN = "="
 
 class ScbOperation(Command):
+    __slots__ = ("operator", "operand1", "operand2")
+
     def __init__(self, op: ScbOp, operand1: ScbSlot, operand2: ScbSlot):
         self.operator = op
         self.operand1 = operand1
         self.operand2 = operand2
 
+    @_cached_resolve
     def resolve(self) -> str:
-        return "scoreboard players operation %s %s %s" % (
-            self.operand1.to_str(),
-            self.operator.value,
-            self.operand2.to_str()
-        )
+        return ("scoreboard players operation " + self.operand1.to_str()
+                + " " + self.operator + " " + self.operand2.to_str())
 
     def scb_did_assign(self, slot: ScbSlot) -> bool:
         if self.operator is ScbOp.SWAP:
@@ -158,48 +211,56 @@ class ScbOperation(Command):
             return slot == self.operand2
 
 class ScbRandom(Command):
+    __slots__ = ("target", "min", "max")
+
     def __init__(self, target: ScbSlot, min_: int, max_: int):
         super().__init__()
         self.target = target
         self.min = min_
         self.max = max_
 
+    @_cached_resolve
     def resolve(self) -> str:
-        return "scoreboard players random %s %d %d" % (
-            self.target.to_str(), self.min, self.max
-        )
+        return (f"scoreboard players random {self.target.to_str()} "
+                f"{self.min} {self.max}")
 
     def scb_did_assign(self, slot: ScbSlot) -> bool:
         return slot == self.target
 
 class ScbObjAdd(Command):
+    __slots__ = ("name", "display_name")
+
     def __init__(self, name: str, display_name: Optional[str] = None):
         super().__init__()
         self.name = name
         self.display_name = display_name
 
+    @_cached_resolve
     def resolve(self) -> str:
         if self.display_name is None:
             suffix = ""
         else:
-            suffix = " %s" % mc_str(self.display_name)
-        return "scoreboard objectives add %s dummy%s" % (
-            mc_str(self.name), suffix
-        )
+            suffix = " " + mc_str(self.display_name)
+        return f"scoreboard objectives add {mc_str(self.name)} dummy{suffix}"
 
 class ScbObjRemove(Command):
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         super().__init__()
         self.name = name
 
+    @_cached_resolve
     def resolve(self) -> str:
-        return "scoreboard objectives remove %s" % mc_str(self.name)
+        return "scoreboard objectives remove " + mc_str(self.name)
 
 class ScbObjDisplay(Command):
+    __slots__ = ("name", "location", "order")
+
     def __init__(self, location: str, name: Optional[str],
                  order: Optional[str] = None):
         super().__init__()
-        if location not in ("sidebar", "list", "belowname"):
+        if location not in _DISPLAY_LOCATIONS:
             raise ValueError("Invalid location: %s" % location)
         if order is not None and name is not None:
             raise ValueError("Can't specify order when clearing display")
@@ -209,12 +270,12 @@ class ScbObjDisplay(Command):
         self.location = location
         self.order = order
 
+    @_cached_resolve
     def resolve(self) -> str:
-        order = " %s" % self.order if self.order else ""
-        scb = "" if self.name is None else " %s" % mc_str(self.name)
-        return "scoreboard objectives setdisplay %s%s%s" % (
-            mc_str(self.location), scb, order
-        )
+        order = " " + self.order if self.order else ""
+        scb = "" if self.name is None else " " + mc_str(self.name)
+        return (f"scoreboard objectives setdisplay {mc_str(self.location)}"
+                f"{scb}{order}")
 
 class MCFunctionFile:
     """Represents a .mcfunction file."""
@@ -228,7 +289,10 @@ class MCFunctionFile:
 
     def has_content(self):
         """Return if there are any commands in this file."""
-        return any((not isinstance(cmd, Comment)) for cmd in self.commands)
+        for cmd in self.commands:
+            if not isinstance(cmd, Comment):
+                return True
+        return False
 
     def cmd_length(self):
         """Return the length of commands (not including comments)."""
@@ -254,9 +318,10 @@ class MCFunctionFile:
     # --- Export Methods ---
 
     def to_str(self, debugging=False) -> str:
+        if debugging:
+            return '\n'.join([cmd.resolve() for cmd in self.commands])
         return '\n'.join([
-            cmd.resolve() for cmd in self.commands
-            if not cmd.is_debug or debugging
+            cmd.resolve() for cmd in self.commands if not cmd.is_debug
         ])
 
     # --- Write Methods ---
@@ -268,13 +333,20 @@ class MCFunctionFile:
         self.commands.extend(map(Comment, comments))
 
     def extend(self, commands: Iterable[Union[str, Command]]):
+        append = self.commands.append
         for command in commands:
             if isinstance(command, Command):
-                self.commands.append(command)
+                append(command)
             else:
-                self.commands.append(Cmd(command))
+                append(Cmd(command))
+
+    def extend_commands(self, commands: Iterable[Command]):
+        """Like `extend`, but all the items must be `Command`s."""
+        self.commands.extend(commands)
 
 class Comment(Command):
+    __slots__ = ("comment", "is_debug")
+
     def __init__(self, comment: str, debug=True):
         if not comment.startswith("#"):
             raise ValueError("Comment must start with '#': %r" % comment)
@@ -287,20 +359,25 @@ class Comment(Command):
 def _scb_check_for_invoke(func: Callable[["_InvokeFunction", ScbSlot], bool]):
     # Decorator for `_InvokeFunction`.
     def _wrapped(self: "_InvokeFunction", slot: ScbSlot) -> bool:
-        if self.file in self._inside_scb_check:
+        inside = self._inside_scb_check
+        if self.file in inside:
             return False
-        self._inside_scb_check.append(self.file)
-        result = func(self, slot)
-        self._inside_scb_check.pop()
-        return result
+        inside.add(self.file)
+        try:
+            return func(self, slot)
+        finally:
+            inside.discard(self.file)
     return _wrapped
 
 class _InvokeFunction(Command):
+    __slots__ = ("file",)
+
     def __init__(self, file: "MCFunctionFile"):
         super().__init__()
         self.file = file
 
-    _inside_scb_check: List[MCFunctionFile] = []
+    # Files whose commands are being checked, to stop recursion
+    _inside_scb_check: Set[MCFunctionFile] = set()
 
     def func_ref(self) -> "MCFunctionFile":
         return self.file
@@ -317,18 +394,22 @@ class _InvokeFunction(Command):
         return False
 
 class InvokeFunction(_InvokeFunction):
+    __slots__ = ()
+
     def resolve(self) -> str:
-        return "function %s" % self.file.get_path()
+        return "function " + self.file.get_path()
 
 class ScheduleFunction(_InvokeFunction):
+    __slots__ = ("args",)
+
     def __init__(self, file: "MCFunctionFile", args: str):
         super().__init__(file)
         self.args = args
 
     def resolve(self) -> str:
-        return "schedule %s %s" % (self.args, self.file.get_path())
+        return f"schedule {self.args} {self.file.get_path()}"
 
-class ScbCompareOp(Enum):
+class ScbCompareOp(str, Enum):
     EQ = "="
     LT = "<"
     GT = ">"
@@ -336,6 +417,8 @@ class ScbCompareOp(Enum):
     GTE = ">="
 
 class _ExecuteSubcmd(metaclass=ABCMeta):
+    __slots__ = ()
+
     @abstractmethod
     def resolve(self) -> str:
         pass
@@ -343,31 +426,39 @@ class _ExecuteSubcmd(metaclass=ABCMeta):
     def scb_did_read(self, slot: ScbSlot) -> bool:
         return False
 
+    def scb_reads(self) -> Iterable[ScbSlot]:
+        """Return all the slots this subcommand reads."""
+        return ()
+
 class ExecuteEnv(_ExecuteSubcmd):
+    __slots__ = ("cmd", "args")
+
     def __init__(self, cmd: str, args: str):
-        if cmd not in ("align", "anchored", "as", "at", "facing",
-                       "in", "positioned", "rotated"):
+        if cmd not in _EXECUTE_ENVS:
             raise ValueError("Invalid env subcommand: %s" % cmd)
         self.cmd = cmd
         self.args = args
 
     def resolve(self) -> str:
-        return "%s %s" % (self.cmd, self.args)
+        return f"{self.cmd} {self.args}"
 
 class ExecuteCond(_ExecuteSubcmd):
+    __slots__ = ("cond", "args", "invert")
+
     def __init__(self, cond: str, args: str, invert=False):
-        if cond not in ("entity", "block", "blocks"):
+        if cond not in _EXECUTE_CONDS:
             raise ValueError("Invalid condition: %s" % cond)
         self.cond = cond
         self.args = args
         self.invert = invert
 
     def resolve(self) -> str:
-        return " ".join(
-            ("unless" if self.invert else "if", self.cond, self.args)
-        )
+        return (f"{'unless' if self.invert else 'if'} "
+                f"{self.cond} {self.args}")
 
 class ExecuteScoreComp(_ExecuteSubcmd):
+    __slots__ = ("operand1", "operand2", "operator", "invert")
+
     def __init__(self, operand1: ScbSlot, operand2: ScbSlot,
                  operator: ScbCompareOp, invert=False):
         super().__init__()
@@ -379,15 +470,17 @@ class ExecuteScoreComp(_ExecuteSubcmd):
     def scb_did_read(self, slot: ScbSlot) -> bool:
         return slot == self.operand1 or slot == self.operand2
 
+    def scb_reads(self) -> Iterable[ScbSlot]:
+        return (self.operand1, self.operand2)
+
     def resolve(self) -> str:
-        return "%s score %s %s %s" % (
-            "unless" if self.invert else "if",
-            self.operand1.to_str(),
-            self.operator.value,
-            self.operand2.to_str()
-        )
+        return (("unless score " if self.invert else "if score ")
+                + self.operand1.to_str() + " " + self.operator + " "
+                + self.operand2.to_str())
 
 class ExecuteScoreMatch(_ExecuteSubcmd):
+    __slots__ = ("operand", "range", "invert")
+
     def __init__(self, operand: ScbSlot, range_: str, invert=False):
         super().__init__()
         self.operand = operand
@@ -397,14 +490,16 @@ class ExecuteScoreMatch(_ExecuteSubcmd):
     def scb_did_read(self, slot: ScbSlot) -> bool:
         return slot == self.operand
 
+    def scb_reads(self) -> Iterable[ScbSlot]:
+        return (self.operand,)
+
     def resolve(self) -> str:
-        return "%s score %s matches %s" % (
-            "unless" if self.invert else "if",
-            self.operand.to_str(),
-            self.range
-        )
+        return (f"{'unless' if self.invert else 'if'} score "
+                f"{self.operand.to_str()} matches {self.range}")
 
 class Execute(Command):
+    __slots__ = ("subcmds", "_read_slots", "runs")
+
     def __init__(self, subcmds: List[_ExecuteSubcmd],
                  runs: Union[Command, str]):
         # An execute without a "run" subcommand is useless in
@@ -412,34 +507,41 @@ class Execute(Command):
         super().__init__()
         if isinstance(runs, str):
             runs = Cmd(runs)
-        self.subcmds: List[_ExecuteSubcmd] = []
-        for subcmd in subcmds:
-            self.add_subcmd(subcmd)
+        self.subcmds: List[_ExecuteSubcmd] = list(subcmds)
+        # Slots read by `subcmds`. Change `subcmds` only through
+        # `add_subcmd` and `filter_subcmds`, which keep this in sync.
+        self._read_slots: Set[ScbSlot] = set()
+        self._update_read_slots()
         if isinstance(runs, Execute):
             self.runs = runs.runs
-            for subcmd in runs.subcmds:
-                self.add_subcmd(subcmd)
+            self.subcmds.extend(runs.subcmds)
+            self._read_slots.update(runs._read_slots)
         else:
             self.runs = runs
 
+    def _update_read_slots(self):
+        self._read_slots = {
+            slot for subcmd in self.subcmds for slot in subcmd.scb_reads()
+        }
+
     def add_subcmd(self, subcmd: _ExecuteSubcmd):
         self.subcmds.append(subcmd)
+        self._read_slots.update(subcmd.scb_reads())
+
+    def filter_subcmds(self, keep: Callable[[_ExecuteSubcmd], bool]):
+        """Remove subcommands for which `keep` returns False."""
+        self.subcmds = [subcmd for subcmd in self.subcmds if keep(subcmd)]
+        self._update_read_slots()
 
     def resolve(self) -> str:
         if not self.subcmds:
             return self.runs.resolve()
-        return "execute %s run %s" % (
-            " ".join(sub.resolve() for sub in self.subcmds),
-            self.runs.resolve()
-        )
+        return ("execute "
+                + " ".join([sub.resolve() for sub in self.subcmds])
+                + " run " + self.runs.resolve())
 
     def scb_did_read(self, slot: ScbSlot) -> bool:
-        if self.runs.scb_did_read(slot):
-            return True
-        for subcmd in self.subcmds:
-            if subcmd.scb_did_read(slot):
-                return True
-        return False
+        return slot in self._read_slots or self.runs.scb_did_read(slot)
 
     def scb_did_assign(self, slot: ScbSlot) -> bool:
         return self.runs.scb_did_assign(slot)
@@ -459,6 +561,8 @@ def execute(subcmds: List[_ExecuteSubcmd], runs: Union[Command, str]):
     return Execute(subcmds, runs)
 
 class RawtextOutput(Command):
+    __slots__ = ("prefix", "score_slots", "components")
+
     def __init__(self, prefix: str, components: List[dict]):
         self.prefix = prefix
         self.score_slots: List[ScbSlot] = []
@@ -478,81 +582,104 @@ class RawtextOutput(Command):
         if last_text:
             self.components.append({"text": "".join(last_text)})
 
+    @staticmethod
+    def _component_json(component: dict) -> str:
+        # Same output as `json.dumps`, without the generic encoder for
+        # the common single-key text and translate components.
+        if len(component) == 1:
+            if "text" in component:
+                return '{"text": %s}' % _encode_json_str(component["text"])
+            if "translate" in component:
+                return ('{"translate": %s}'
+                        % _encode_json_str(component["translate"]))
+        return json.dumps(component)
+
+    @_cached_resolve
     def resolve(self) -> str:
-        return "%s %s" % (
-            self.prefix, json.dumps({"rawtext": self.components})
-        )
+        return (self.prefix + ' {"rawtext": ['
+                + ", ".join(map(self._component_json, self.components))
+                + "]}")
 
     def scb_did_read(self, slot: ScbSlot) -> bool:
         return slot in self.score_slots
 
 class TitlerawTimes(Command):
+    __slots__ = ("player", "fade_in", "stay", "fade_out")
+
     def __init__(self, player: str, fade_in: int, stay: int, fade_out: int):
         self.player = player
         self.fade_in = fade_in
         self.stay = stay
         self.fade_out = fade_out
 
+    @_cached_resolve
     def resolve(self) -> str:
-        return "titleraw %s times %d %d %d" % (
-            self.player, self.fade_in, self.stay, self.fade_out
-        )
+        return (f"titleraw {self.player} times {self.fade_in} "
+                f"{self.stay} {self.fade_out}")
 
 class TitlerawResetTimes(Command):
+    __slots__ = ("player",)
+
     def __init__(self, player: str):
         self.player = player
 
+    @_cached_resolve
     def resolve(self) -> str:
-        return "titleraw %s reset" % self.player
+        return f"titleraw {self.player} reset"
 
 class TitlerawClear(Command):
+    __slots__ = ("player",)
+
     def __init__(self, player: str):
         self.player = player
 
+    @_cached_resolve
     def resolve(self) -> str:
-        return "titleraw %s clear" % self.player
+        return f"titleraw {self.player} clear"
 
 class FunctionsManager:
     EXTRA_OBJ = "%s{id}"
 
     def __init__(self, scoreboard: str):
-        self.scoreboard = scoreboard
+        # Names here are compared over and over again by the
+        # optimizer, so they are interned.
+        self.scoreboard = sys.intern(scoreboard)
         self.files: List["MCFunctionFile"] = []
         self._alloc_id = 0
         self._int_consts: Dict[int, ScbSlot] = {}
-        self._scb_id = 0
-        self._extra_obj = self.EXTRA_OBJ % scoreboard
+        self._scoreboards: List[str] = []
+        self._extra_obj = self.EXTRA_OBJ % self.scoreboard
         self.default_scb = self.add_scoreboard()
 
     def generate_init(self) -> List[Command]:
-        res = []
         # Scoreboards
-        res.append(Comment('# Register scoreboard(s)'))
-        res.extend([
-            ScbObjAdd(self._extra_obj.format(id=i))
-            for i in range(1, self._scb_id + 1)
-        ])
+        res: List[Command] = [Comment('# Register scoreboard(s)')]
+        res.extend(map(ScbObjAdd, self._scoreboards))
         # Constants
         if self._int_consts:
             res.append(Comment('# Load constants'))
-            res.extend([
-                ScbSetConst(slot, num)
-                for num, slot in self._int_consts.items()
-            ])
+            res.extend(map(ScbSetConst,
+                           self._int_consts.values(), self._int_consts))
         return res
 
     def allocate(self) -> ScbSlot:
         self._alloc_id += 1
-        return ScbSlot("acacia%d" % self._alloc_id, self.default_scb)
+        return ScbSlot(
+            sys.intern("acacia%d" % self._alloc_id), self.default_scb
+        )
 
     def add_file(self, file: "MCFunctionFile"):
         self.files.append(file)
 
     def int_const(self, number: int) -> ScbSlot:
-        if number not in self._int_consts:
-            self._int_consts[number] = self.allocate()
-        return self._int_consts[number]
+        slot = self._int_consts.get(number)
+        if slot is None:
+            slot = self._int_consts[number] = self.allocate()
+        return slot
 
     def add_scoreboard(self) -> str:
-        self._scb_id += 1
-        return self._extra_obj.format(id=self._scb_id)
+        name = sys.intern(
+            self._extra_obj.format(id=len(self._scoreboards) + 1)
+        )
+        self._scoreboards.append(name)
+        return name
@@ -7,7 +7,7 @@ from abc import ABCMeta, abstractmethod
 
 from acaciamc.mccmdgen.symbol import SymbolTable
 from acaciamc.mccmdgen.utils import InvalidOpError
-from acaciamc.error import traced_call
+from acaciamc.error import Error
 
 if TYPE_CHECKING:
     from acaciamc.ast import Operator
@@ -32,6 +32,9 @@ class CTDataType:
         return False
 
 class CTObj:
+    # Empty, so that `ConstExprCombined` can combine this with the
+    # slots of `AcaciaExpr`.
+    __slots__ = ()
     cdata_type: CTDataType
 
     def __init__(self, *args, **kwds):
@@ -115,7 +118,8 @@ class CTCallable(CTObj, metaclass=ABCMeta):
         self, args: List["CTObj"], kwds: Dict[str, "CTObj"],
         compiler, location: Optional["SourceLocation"] = None
     ) -> CTExpr:
-        return traced_call(
-            self.ccall, location, self.source, self.func_repr,
-            args, kwds, compiler
-        )
+        try:
+            return self.ccall(args, kwds, compiler)
+        except Error as err:
+            err.add_call_frame(location, self.source, self.func_repr)
+            raise
@@ -79,10 +79,23 @@ class AcaciaExpr:
     When you are not satisfied with input operand type, please raise
     `InvalidOpError`.
     """
+    # Subclasses that do not declare `__slots__` get a `__dict__` as
+    # usual, so only classes that fully declare their slots save it.
+    __slots__ = ("data_type", "_attribute_table")
+
     def __init__(self, type_: "DataType"):
         super().__init__()
         self.data_type = type_
-        self.attribute_table = SymbolTable()
+        self._attribute_table: Optional[SymbolTable] = None
+
+    @property
+    def attribute_table(self) -> SymbolTable:
+        # Most expressions never have any attribute, so the table is
+        # not created until it is used.
+        table = self._attribute_table
+        if table is None:
+            table = self._attribute_table = SymbolTable()
+        return table
 
     def is_assignable(self) -> bool:
         """Return whether this expression is a lvalue at runtime."""
@@ -173,6 +186,8 @@ class AcaciaExpr:
         raise InvalidOpError
 
 class ConstExpr(AcaciaExpr, metaclass=ABCMeta):
+    __slots__ = ()
+
     @abstractmethod
     def to_ctexpr(self) -> "CTExpr":
         pass
@@ -188,6 +203,8 @@ class VarValue(AcaciaExpr):
     e.g. scb("x", "scb") -> IntVar(ScbSlot("x", "scb")) -> Assignable
     e.g. bool -> Type -> Unassignable
     """
+    __slots__ = ()
+
     is_temporary = False  # used as a temporary and is read-only
 
     def swap(self, other: "VarValue", compiler: "Compiler") -> CMDLIST_T:
@@ -198,6 +215,8 @@ class VarValue(AcaciaExpr):
 
 class AcaciaCallable(AcaciaExpr, metaclass=ABCMeta):
     """Acacia expressions that are callable."""
+    __slots__ = ()
+
     def __init__(self, *args, **kwds):
         super().__init__(*args, **kwds)
         self.source: Optional[SourceLocation] = None
@@ -211,10 +230,11 @@ class AcaciaCallable(AcaciaExpr, metaclass=ABCMeta):
         Call this expression, and add this to error frame if an error
         occurs.
         """
-        return traced_call(
-            self.call, location, self.source, self.func_repr,
-            args, keywords, compiler
-        )
+        try:
+            return self.call(args, keywords, compiler)
+        except Error as err:
+            err.add_call_frame(location, self.source, self.func_repr)
+            raise
 
     @abstractmethod
     def call(self, args: ARGS_T, keywords: KEYWORDS_T,
@@ -227,31 +247,39 @@ class AcaciaCallable(AcaciaExpr, metaclass=ABCMeta):
         """
         pass
 
+def _ct2rt(func):
+    # Make a compile time operator method usable as a runtime one by
+    # dropping the `compiler` argument.
+    def newfunc(self, *args, **kwds):
+        if "compiler" in kwds:
+            kwds.pop("compiler")
+        else:
+            args = list(args)
+            args.pop()
+        return func(self, *args, **kwds)
+    return newfunc
+
+# (runtime method name, its default implementation,
+#  compile time method name, its default implementation)
+_CT2RT_METHODS = tuple(
+    (meth, getattr(AcaciaExpr, meth), "c" + meth, getattr(CTObj, "c" + meth))
+    for meth in (
+        'add', 'sub', 'mul', 'div', 'mod',
+        'radd', 'rsub', 'rmul', 'rdiv', 'rmod',
+        'unarypos', 'unaryneg', 'unarynot'
+    )
+)
+
 class ConstExprCombined(ConstExpr, CTObj):
+    __slots__ = ("attributes",)
+
     def __init_subclass__(cls) -> None:
-        def ct2rt(func):
-            def newfunc(self, *args, **kwds):
-                if "compiler" in kwds:
-                    kwds.pop("compiler")
-                else:
-                    args = list(args)
-                    args.pop()
-                return func(self, *args, **kwds)
-            return newfunc
-        for meth in (
-            'add', 'sub', 'mul', 'div', 'mod',
-            'radd', 'rsub', 'rmul', 'rdiv', 'rmod',
-            'unarypos', 'unaryneg', 'unarynot'
-        ):
-            rtfunc = getattr(cls, meth)
-            defrt = getattr(AcaciaExpr, meth)
-            if rtfunc is not defrt:
+        for meth, defrt, cmeth, defct in _CT2RT_METHODS:
+            if getattr(cls, meth) is not defrt:
                 continue  # already defined
-            cmeth = f"c{meth}"
             ctfunc = getattr(cls, cmeth)
-            defct = getattr(CTObj, cmeth)
             if ctfunc is not defct:
-                setattr(cls, meth, ct2rt(ctfunc))
+                setattr(cls, meth, _ct2rt(ctfunc))
 
     def __init__(self, *args, **kwds):
         super().__init__(*args, **kwds)
@@ -38,6 +38,13 @@ OP2METHOD = {
     Operator.not_: 'unarynot'
 }
 
+def _op_implemented(expr: AcaciaExpr, meth: str) -> bool:
+    """Return whether `expr` overrides the operator method `meth`.
+    The default implementations in `AcaciaExpr` always raise
+    `InvalidOpError`, so calling them can be skipped.
+    """
+    return getattr(type(expr), meth) is not getattr(AcaciaExpr, meth)
+
 class Context:
     def __init__(self, scope: SymbolTable):
         self.scope: SymbolTable = scope
@@ -1045,8 +1052,11 @@ class Generator(ASTVisitor):
 
     def visit_UnaryOp(self, node: UnaryOp):
         operand = self.visit(node.operand)
+        meth = OP2METHOD[node.operator]
+        if not _op_implemented(operand, meth):
+            self._op_error(node.operator, operand)
         try:
-            res = getattr(operand, OP2METHOD[node.operator])(self.compiler)
+            res = getattr(operand, meth)(self.compiler)
         except InvalidOpError:
             self._op_error(node.operator, operand)
         return res
@@ -1054,14 +1064,18 @@ class Generator(ASTVisitor):
     def visit_BinOp(self, node: BinOp):
         left, right = self.visit(node.left), self.visit(node.right)
         meth = OP2METHOD[node.operator]
-        try:
-            res = getattr(left, meth)(right, self.compiler)
-        except InvalidOpError:
+        if _op_implemented(left, meth):
             try:
-                res = getattr(right, f"r{meth}")(left, self.compiler)
+                return getattr(left, meth)(right, self.compiler)
             except InvalidOpError:
-                self._op_error(node.operator, left, right)
-        return res
+                pass
+        rmeth = "r" + meth
+        if _op_implemented(right, rmeth):
+            try:
+                return getattr(right, rmeth)(left, self.compiler)
+            except InvalidOpError:
+                pass
+        self._op_error(node.operator, left, right)
 
     def visit_CompareOp(self, node: CompareOp):
         compares = []
@@ -2,7 +2,7 @@
 
 __all__ = ["MCSelector", "SELECTORVAR_T"]
 
-from typing import Union, Dict, Any, Optional
+from typing import Union, Dict, Any, Optional, AbstractSet
 from copy import deepcopy
 
 from acaciamc.mccmdgen.cmds import mc_str
@@ -13,12 +13,24 @@ class MCSelector:
     """Low-level utility for Minecraft selectors."""
     def __init__(self, var: Union[SELECTORVAR_T, None] = None) -> None:
         # When `var` is None, the variable is unknown.
-        self.var = var
+        self._var = var
         self.args: Dict[str, Any] = {}
+        # Cached result of `to_str`; every mutator resets it.
+        self._str: Optional[str] = None
+
+    @property
+    def var(self) -> Union[SELECTORVAR_T, None]:
+        return self._var
+
+    @var.setter
+    def var(self, var: Union[SELECTORVAR_T, None]):
+        self._var = var
+        self._str = None
 
     def copy(self) -> "MCSelector":
-        res = MCSelector(self.var)
+        res = MCSelector(self._var)
         res.args = deepcopy(self.args)
+        res._str = self._str
         return res
 
     def is_var_set(self) -> bool:
@@ -27,6 +39,9 @@ class MCSelector:
     def has_arg(self, arg: str) -> bool:
         return arg in self.args
 
+    def has_any_arg(self, args: AbstractSet[str]) -> bool:
+        return not self.args.keys().isdisjoint(args)
+
     @staticmethod
     def arg_to_str(arg: str, value):
         if arg in ("type", "name", "m"):
@@ -71,15 +86,18 @@ class MCSelector:
             raise ValueError("Unknown selector argument: %r" % arg)
 
     def to_str(self):
-        var = self.var
-        if var is None:
-            var = "e"  # when var is not set it should be all entities
-        return "@%s%s" % (
-            var,
-            "[%s]" % ",".join(self.arg_to_str(arg, value)
-                              for arg, value in self.args.items())
-            if self.args else ""
-        )
+        res = self._str
+        if res is None:
+            var = self._var
+            if var is None:
+                var = "e"  # when var is not set it should be all entities
+            res = self._str = "@%s%s" % (
+                var,
+                "[%s]" % ",".join(self.arg_to_str(arg, value)
+                                  for arg, value in self.args.items())
+                if self.args else ""
+            )
+        return res
 
     def player_type(self):
         if self.has_arg("type"):
@@ -89,65 +107,79 @@ class MCSelector:
             self.type("player")
 
     def tag(self, *tag: str):
+        self._str = None
         if not self.has_arg("tag"):
             self.args["tag"] = []
         self.args["tag"].extend(map(mc_str, tag))
 
     def tag_n(self, *tag: str):
+        self._str = None
         if not self.has_arg("tag!"):
             self.args["tag!"] = []
         self.args["tag!"].extend(map(mc_str, tag))
 
     def type(self, type_: str):
+        self._str = None
         self.args["type"] = type_
 
     def type_n(self, *types: str):
+        self._str = None
         if not self.has_arg("type!"):
             self.args["type!"] = []
         self.args["type!"].extend(types)
 
     def family(self, *families: str):
+        self._str = None
         if not self.has_arg("family"):
             self.args["family"] = []
         self.args["family"].extend(families)
 
     def family_n(self, *families: str):
+        self._str = None
         if not self.has_arg("family!"):
             self.args["family!"] = []
         self.args["family!"].extend(families)
 
     def limit(self, limit: int):
+        self._str = None
         self.args["c"] = limit
 
     def distance(self, min_: Optional[float], max_: Optional[float]):
+        self._str = None
         if min_ is not None:
             self.args["rm"] = min_
         if max_ is not None:
             self.args["r"] = max_
 
     def volume(self, dx: float, dy: float, dz: float):
+        self._str = None
         self.args["dx"] = dx
         self.args["dy"] = dy
         self.args["dz"] = dz
 
     def rot_vertical(self, min_: float, max_: float):
+        self._str = None
         self.args["rxm"] = min_
         self.args["rx"] = max_
 
     def rot_horizontal(self, min_: float, max_: float):
+        self._str = None
         self.args["rym"] = min_
         self.args["ry"] = max_
 
     def name(self, name: str):
+        self._str = None
         self.args["name"] = mc_str(name)
 
     def name_n(self, *names: str):
+        self._str = None
         if not self.has_arg("name!"):
             self.args["name!"] = []
         self.args["name!"].extend(map(mc_str, names))
 
     def has_item(self, item: str, quantity: str, data: Optional[int],
                  slot_type: Optional[str], slot_num: Optional[int]):
+        self._str = None
         if not self.has_arg("hasitem"):
             self.args["hasitem"] = []
         v = {"item": item, "quantity": quantity}
@@ -160,30 +192,36 @@ class MCSelector:
         self.args["hasitem"].append(v)
 
     def scores(self, objective: str, range_: str):
+        self._str = None
         if not self.has_arg("scores"):
             self.args["scores"] = []
         self.args["scores"].append((mc_str(objective), range_))
 
     def level(self, min_: Optional[int], max_: Optional[int]):
+        self._str = None
         if min_ is not None:
             self.args["lm"] = min_
         if max_ is not None:
             self.args["l"] = max_
 
     def game_mode(self, mode: str):
+        self._str = None
         self.args["m"] = mode
 
     def game_mode_n(self, *modes: str):
+        self._str = None
         if not self.has_arg("m!"):
             self.args["m!"] = []
         self.args["m!"].extend(modes)
 
     def has_permission(self, *permissions: str):
+        self._str = None
         if not self.has_arg("haspermission"):
             self.args["haspermission"] = ([], [])
         self.args["haspermission"][0].extend(permissions)
 
     def has_permission_n(self, *permissions: str):
+        self._str = None
         if not self.has_arg("haspermission"):
             self.args["haspermission"] = ([], [])
         self.args["haspermission"][1].extend(permissions)
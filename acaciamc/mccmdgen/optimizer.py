@@ -4,10 +4,21 @@ __all__ = ["Optimizer"]
 
 from typing import Iterable, Dict, Set, List, Tuple
 from abc import ABCMeta, abstractmethod
+from collections import deque
 
 import acaciamc.mccmdgen.cmds as cmds
 from acaciamc.mccmdgen.utils import unreachable
 
+# /execute subcommands that do not change the execution environment;
+# calls prefixed with only these can be inlined.
+_INLINABLE_SUBCMDS = frozenset((
+    cmds.ExecuteScoreComp, cmds.ExecuteScoreMatch, cmds.ExecuteCond
+))
+
+def _not_as_self(subcmd: "cmds._ExecuteSubcmd") -> bool:
+    return not (isinstance(subcmd, cmds.ExecuteEnv)
+                and subcmd.cmd == "as" and subcmd.args == "@s")
+
 class Optimizer(cmds.FunctionsManager, metaclass=ABCMeta):
     def optimize(self):
         """Start optimizing."""
@@ -28,20 +39,19 @@ class Optimizer(cmds.FunctionsManager, metaclass=ABCMeta):
         """Remove unreferenced functions."""
         ref_map: Dict[cmds.MCFunctionFile, Set[cmds.MCFunctionFile]] = {}
         for file in self.files:
-            refs = set(command.func_ref() for command in file.commands)
-            if None in refs:
-                refs.remove(None)
+            refs = {command.func_ref() for command in file.commands}
+            refs.discard(None)
             ref_map[file] = refs
         visited = set()
-        def _visit(file: cmds.MCFunctionFile):
+        queue = deque(self.entry_files())
+        while queue:
+            file = queue.popleft()
             if file in visited:
-                return
+                continue
             visited.add(file)
-            for ref in ref_map[file]:
-                _visit(ref)
-        for file in self.entry_files():
-            _visit(file)
-        self.files = list(visited)
+            queue.extend(ref_map[file])
+        # Keep the original order so that output is deterministic
+        self.files = [file for file in self.files if file in visited]
 
     @property
     @abstractmethod
@@ -65,48 +75,48 @@ class Optimizer(cmds.FunctionsManager, metaclass=ABCMeta):
     def opt_function_inliner(self):
         """Expand mcfunctions that only have 1 reference."""
         # Locating optimizable
-        todo: Dict[cmds.MCFunctionFile,
-                   Tuple[cmds.MCFunctionFile, int, bool]] = {}
-        called: Set[cmds.MCFunctionFile] = set()
+        # Only functions with exactly 1 reference are inlined, so count
+        # references first and only check the call site of those.
+        ref_count: Dict[cmds.MCFunctionFile, int] = {}
+        first_site: Dict[cmds.MCFunctionFile,
+                         Tuple[cmds.MCFunctionFile, int]] = {}
         for file in self.files:
-            allow_execute = not self.dont_inline_execute_call(file)
             for i, command in enumerate(file.commands):
                 callee = command.func_ref()
                 if callee is None:
                     continue
-                if callee in called:
-                    # More than 1 references
-                    if callee in todo:
-                        del todo[callee]
-                    continue
-                called.add(callee)
-                subcmds, runs = self._resolve_execute(command)
-                if not isinstance(runs, cmds.InvokeFunction):
-                    # Not a direct /function call
-                    continue
-                passed_test = (
-                    (not subcmds)
-                    or (
-                        # If there is /execute...
-                        # Caller allows inlining calls with execute
-                        allow_execute
-                        # Environments other than if/unless may change
-                        # during execution of commands, so we can't
-                        # inline it.
-                        and (all([
-                            isinstance(
-                                subcmd, (
-                                    cmds.ExecuteScoreComp,
-                                    cmds.ExecuteScoreMatch,
-                                    cmds.ExecuteCond
-                                )
-                            )
-                            for subcmd in subcmds
-                        ]))
-                    )
+                if callee in ref_count:
+                    ref_count[callee] += 1
+                else:
+                    ref_count[callee] = 1
+                    first_site[callee] = (file, i)
+        # callee -> (caller, index of call, /execute subcommands
+        #            of call, whether callee must have 1 command)
+        todo: Dict[cmds.MCFunctionFile,
+                   Tuple[cmds.MCFunctionFile, int,
+                         List[cmds._ExecuteSubcmd], bool]] = {}
+        for callee, (file, i) in first_site.items():
+            if ref_count[callee] != 1:
+                continue
+            subcmds, runs = self._resolve_execute(file.commands[i])
+            if not isinstance(runs, cmds.InvokeFunction):
+                # Not a direct /function call
+                continue
+            passed_test = (
+                (not subcmds)
+                or (
+                    # If there is /execute...
+                    # Caller allows inlining calls with execute
+                    (not self.dont_inline_execute_call(file))
+                    # Environments other than if/unless may change
+                    # during execution of commands, so we can't
+                    # inline it.
+                    and all(type(subcmd) in _INLINABLE_SUBCMDS
+                            for subcmd in subcmds)
                 )
-                if passed_test or callee.cmd_length() == 1:
-                    todo[callee] = (file, i, not passed_test)
+            )
+            if passed_test or callee.cmd_length() == 1:
+                todo[callee] = (file, i, subcmds, not passed_test)
         # Optimize
         # for callee, (caller, caller_index) in todo.items():
         #     print("Inlining %s, called by %s at %d" % (
@@ -116,35 +126,27 @@ class Optimizer(cmds.FunctionsManager, metaclass=ABCMeta):
         def _need_tmp(subcmds, commands: List[cmds.Command]) -> bool:
             slots = set()
             for subcmd in subcmds:
-                if isinstance(subcmd, cmds.ExecuteCond):
+                type_ = type(subcmd)
+                if type_ is cmds.ExecuteCond:
                     return True
-                if isinstance(subcmd, cmds.ExecuteScoreComp):
-                    slots.add(subcmd.operand1)
-                    slots.add(subcmd.operand2)
-                elif isinstance(subcmd, cmds.ExecuteScoreMatch):
-                    slots.add(subcmd.operand)
-                else:
+                if type_ not in _INLINABLE_SUBCMDS:
                     unreachable()
-            for command in commands:
-                for slot in slots:
-                    if command.scb_did_assign(slot):
-                        return True
-            return False
+                slots.update(subcmd.scb_reads())
+            return any(command.scb_did_assign(slot)
+                       for command in commands for slot in slots)
+        tasks_of: Dict[cmds.MCFunctionFile,
+                       List[Tuple[int, cmds.MCFunctionFile,
+                                  List[cmds._ExecuteSubcmd], bool]]] = {}
+        for callee, (caller, caller_index, subcmds, ensure_l1) \
+                in todo.items():
+            tasks_of.setdefault(caller, []).append(
+                (caller_index, callee, subcmds, ensure_l1)
+            )
         def _merge(caller: cmds.MCFunctionFile):
-            if caller in merged:
-                return
-            merged.add(caller)
-            tasks: List[Tuple[int, cmds.MCFunctionFile, bool]] = []
-            for callee, (caller_got, caller_index, ensure_l1) in todo.items():
-                if caller_got != caller:
-                    continue
-                _merge(callee)
-                tasks.append((caller_index, callee, ensure_l1))
+            tasks = tasks_of.get(caller, [])
             tasks.sort(key=lambda x: x[0], reverse=True)
-            for index, callee, ensure_len1 in tasks:
-                subcmds, _ = self._resolve_execute(caller.commands[index])
+            for index, callee, subcmds, ensure_len1 in tasks:
                 callee_len = callee.cmd_length()
-                # Here `runs` must be /function that calls `callee`
                 if subcmds and callee_len > self.max_inline_file_size:
                     # Prefixing every command in a long file with
                     # /execute condition can reduce performance,
@@ -179,20 +181,32 @@ class Optimizer(cmds.FunctionsManager, metaclass=ABCMeta):
                 inserts.append(cmds.Comment("## Inline of %s ended" % fp))
                 caller.commands[index : index+1] = inserts
                 self.files.remove(callee)
-        for caller, _, _ in todo.values():
-            if caller not in todo:
-                _merge(caller)
+        # Callees must be merged before their caller. Walk the call
+        # tree in post-order with an explicit stack; `expanded` is True
+        # once the callees of `caller` have been pushed.
+        for root, _, _, _ in todo.values():
+            if root in todo:
+                continue
+            stack = [(root, False)]
+            while stack:
+                caller, expanded = stack.pop()
+                if expanded:
+                    _merge(caller)
+                elif caller not in merged:
+                    merged.add(caller)
+                    stack.append((caller, True))
+                    stack.extend(
+                        (callee, False)
+                        for _, callee, _, _
+                        in reversed(tasks_of.get(caller, ()))
+                    )
 
     def opt_execute_as_ats(self):
         """Remove "as @s" in /execute commands. """
         for file in self.files:
             for i, command in enumerate(file.commands):
                 if isinstance(command, cmds.Execute):
-                    for j, subcmd in enumerate(command.subcmds):
-                        if (isinstance(subcmd, cmds.ExecuteEnv)
-                                and subcmd.cmd == "as"
-                                and subcmd.args == "@s"):
-                            del command.subcmds[j]
+                    command.filter_subcmds(_not_as_self)
                     if not command.subcmds:
                         # /execute with only a run subcommand can get
                         # rid of the /execute.
@@ -201,10 +215,13 @@ class Optimizer(cmds.FunctionsManager, metaclass=ABCMeta):
     def opt_empty_functions(self):
         """Remove definition and invoke of empty functions."""
         removed = set()
-        for i, file in reversed(tuple(enumerate(self.files))):
-            if not file.has_content():
+        kept = []
+        for file in self.files:
+            if file.has_content():
+                kept.append(file)
+            else:
                 removed.add(file)
-                del self.files[i]
+        self.files = kept
         for file in self.files:
             for i, command in enumerate(file.commands):
                 ref = command.func_ref()
@@ -1,10 +1,10 @@
 """math - Math related utilities."""
-from typing import List, Optional, TYPE_CHECKING
+from typing import List, Tuple, Optional, TYPE_CHECKING
 
 from acaciamc.objects import *
 from acaciamc.mccmdgen.expr import *
 from acaciamc.objects.integer import (
-    IntRandom, IntCmdOp, IntOpSelf, IntOpVar, IntOp, STR2SCBOP
+    IntRandom, IntOpSelf, IntOpVar, IntOp, STR2SCBOP
 )
 from acaciamc.ast import ModuleMeta
 from acaciamc.tools import axe
@@ -103,6 +103,45 @@ class IntRestrict(IntOp):
             )
         ]
 
+class IntOpVars(IntOp):
+    """Apply `op` to the value with each slot in `operands` in turn.
+    The commands paired with a slot are run right before it is used.
+    """
+    def __init__(self, op: str,
+                 operands: List[Tuple[CMDLIST_T, cmds.ScbSlot]]) -> None:
+        self.op = STR2SCBOP[op]
+        self.operands = operands
+
+    def scb_did_read(self, slot: cmds.ScbSlot) -> bool:
+        for deps, var_slot in self.operands:
+            if slot == var_slot:
+                return True
+            for c in deps:
+                if c.scb_did_read(slot):
+                    return True
+        return False
+
+    def scb_did_assign(self, slot: cmds.ScbSlot) -> bool:
+        for deps, _ in self.operands:
+            for c in deps:
+                if c.scb_did_assign(slot):
+                    return True
+        return False
+
+    def resolve(self, var: IntVar) -> CMDLIST_T:
+        res = []
+        for deps, slot in self.operands:
+            res.extend(deps)
+            res.append(cmds.ScbOperation(self.op, var.slot, slot))
+        return res
+
+def _operand_vars(operands: List[AcaciaExpr], compiler: "Compiler"):
+    res = []
+    for operand in operands:
+        deps, var = to_IntVar(operand, compiler)
+        res.append((deps, var.slot))
+    return res
+
 @axe.chop
 @axe.star_arg("operands", IntDataType)
 def _min(compiler, operands: List[AcaciaExpr]):
@@ -126,10 +165,8 @@ def _min(compiler, operands: List[AcaciaExpr]):
     # Get first arg
     res = IntOpGroup.from_intexpr(rest[0])
     # Handle args left
-    for operand in rest[1:]:
-        deps, var = to_IntVar(operand, compiler)
-        res.add_op(IntCmdOp(deps))
-        res.add_op(IntOpVar("<", var.slot))
+    if len(rest) > 1:
+        res.add_op(IntOpVars("<", _operand_vars(rest[1:], compiler)))
     if upper is not None:
         res.add_op(IntRestrict(upper, is_upper=True))
     return res
@@ -157,10 +194,8 @@ def _max(compiler, operands: List[AcaciaExpr]):
     # Get first arg
     res = IntOpGroup.from_intexpr(rest[0])
     # Handle args left
-    for operand in rest[1:]:
-        deps, var = to_IntVar(operand, compiler)
-        res.add_op(IntCmdOp(deps))
-        res.add_op(IntOpVar(">", var.slot))
+    if len(rest) > 1:
+        res.add_op(IntOpVars(">", _operand_vars(rest[1:], compiler)))
     if lower is not None:
         res.add_op(IntRestrict(lower, is_upper=False))
     return res
@@ -4,6 +4,7 @@ NOTE Python package `mido` is required.
 """
 
 from typing import Dict, TYPE_CHECKING
+import heapq
 try:
     from itertools import pairwise
 except ImportError:
@@ -285,32 +286,47 @@ class Music(ConstExprCombined):
         self.midi = midi
         self.listener_str = listener_str
         self.note_offset = note_offset
+        # MC pitch of each MIDI note (0-127)
+        self.pitches = [2 ** ((note + note_offset - 54) / 12 - 1)
+                        for note in range(128)]
         self.chunk_size = chunk_size
-        self.override_instrument = instrument
-        self.tracks = [t.copy() for t in midi.tracks]
+        # MC sound of each MIDI instrument (0-127)
+        self.instruments = tuple(
+            instrument.get(ins_id, ID2INSTRUMENT[ins_id])
+            for ins_id in range(128)
+        )
         # Check MIDI type
         if midi.type != 0 and midi.type != 1:
             raise Error(ErrorType.ANY,
                         message=localize("modules.music.music.init.unsupported") % midi.type)
         # Speed settings
-        self.bpm = 120
         self.mt_per_beat = midi.ticks_per_beat
         self.user_speed = speed
+        self.set_bpm(120)
         # Ticking
         self.mt = 0
         self.gt = 0.0
         self.gt_int = 0  # Always == round(self.gt)
         self.last_gt_int = 0
-        # last_msg_mt: track id to MT when last Message is handled
-        self.last_msg_mt = dict.fromkeys(range(len(midi.tracks)), 0)
-        # Channel info
-        self.channel_volume = {}  # channel id to volume (0-15)
-        self.channel_instrument = {}  # channel id to instrument id
+        # events: heap of (MT, track id, Message) of all messages.
+        # At most 1 message of a track is handled in 1 MT, so messages
+        # after the first one in a track are handled at least 1 MT
+        # after the previous one.
+        self.events = []
+        for i, track in enumerate(midi.tracks):
+            mt = None
+            for message in track:
+                if mt is None:
+                    mt = message.time
+                else:
+                    mt += max(message.time, 1)
+                self.events.append((mt, i, message))
+        heapq.heapify(self.events)
+        # Channel info (indexed by channel id 0-15)
         ## Default instrument: 0~8 & 10~15: Piano (0); 9: Drum set (127)
         ## Default volume: 100
-        for i in range(16):
-            self.channel_instrument[i] = 0
-            self.channel_volume[i] = 100
+        self.channel_volume = [100] * 16
+        self.channel_instrument = [0] * 16
         self.channel_instrument[9] = 127
         # Timer:
         #   when 0 <= timer <= music length, the music is playing
@@ -319,19 +335,29 @@ class Music(ConstExprCombined):
         #       it will be reset next GT so that it will play again
         #   when timer < 0, it's the countdown before we start playing
         self.timer = IntVar.new(compiler)
+        # /execute subcommands that make listeners play a note
+        self.listener_subcmds = [cmds.ExecuteEnv("as", listener_str),
+                                 cmds.ExecuteEnv("at", "@s")]
+        # /execute subcommands of notes in GT `note_subcmds_gt`
+        self.note_subcmds = []
+        self.note_subcmds_gt = -1
         # Volume
         self.user_volume = volume
-        self.user_channel_volume = dict.fromkeys(range(16), 1.0)
-        self.user_channel_volume.update(channel_volume)
+        self.user_channel_volume = [
+            channel_volume.get(channel, 1.0) for channel in range(16)
+        ]
         # Create file
         self.files = []
         # file_sep_gt: in which GT we seperate the file
         self.file_sep_gt = []
         self.cur_chunk_size = 0  # Commands written in current file
+        # Notes of current GT, written to file when GT changes
+        self.pending_notes: CMDLIST_T = []
         self.new_file()  # Initial file
         # Go
         while not self.is_finished():
             self.main_loop()
+        self.flush_notes()
         GT_LEN = self.gt_int  # Length of music in GT
         # The last file may be useless
         if not self.files[-1].has_content():
@@ -390,39 +416,70 @@ class Music(ConstExprCombined):
 
     def main_loop(self):
         # Read messages
-        for i, track in enumerate(self.tracks):
-            if not track:
-                continue
-            message = track[0]
-            if message.time > self.mt - self.last_msg_mt[i]:
-                continue
+        events = self.events
+        handlers = self.MESSAGE_HANDLERS
+        while events and events[0][0] == self.mt:
+            _, _, message = heapq.heappop(events)
             # Handle message
-            mtype = message.type
-            if mtype == "note_on":
-                if message.velocity != 0:
-                    self.play_note(message)
-            elif mtype == "set_tempo":
-                self.bpm = 6E+7 / message.tempo
-            elif message.is_cc():
-                if message.control == 7:  # Volume
-                    self.channel_volume[message.channel] = message.value
-            elif mtype == "program_change":
-                self.channel_instrument[message.channel] = message.program
-            # Reset timer
-            self.last_msg_mt[i] = self.mt
-            track.pop(0)
-        # Time increment
-        self.mt += 1
+            handler = handlers.get(message.type)
+            if handler is not None:
+                handler(self, message)
+        # Time increment: skip to the next MT that has messages. Tempo
+        # does not change in between.
+        next_mt = events[0][0] if events else self.mt + 1
+        gt_per_mt = self.gt_per_mt
+        gt = self.gt
+        ticks = next_mt - self.mt
+        while ticks:
+            ticks -= 1
+            gt += gt_per_mt
+            gt_int = round(gt)
+            # Update last_gt_int
+            if gt_int > self.last_gt_int:
+                self.gt_int = self.last_gt_int = gt_int
+                self.flush_notes()
+                # New file check
+                if self.cur_chunk_size >= self.chunk_size:
+                    self.new_file()
+                # Nothing is written until `next_mt`, so the checks
+                # above won't do anything in the rest of the ticks.
+                # GT is still added up tick by tick so that it rounds
+                # the same way.
+                for _ in range(ticks):
+                    gt += gt_per_mt
+                break
+        self.mt = next_mt
+        self.gt = gt
+        self.gt_int = round(gt)
+        self.last_gt_int = max(self.last_gt_int, self.gt_int)
+
+    def on_note_on(self, message):
+        if message.velocity != 0:
+            self.play_note(message)
+
+    def on_set_tempo(self, message):
+        self.set_bpm(6E+7 / message.tempo)
+
+    def on_control_change(self, message):
+        if message.control == 7:  # Volume
+            self.channel_volume[message.channel] = message.value
+
+    def on_program_change(self, message):
+        self.channel_instrument[message.channel] = message.program
+
+    # Message type to handler; other messages are ignored
+    MESSAGE_HANDLERS = {
+        "note_on": on_note_on,
+        "set_tempo": on_set_tempo,
+        "control_change": on_control_change,
+        "program_change": on_program_change,
+    }
+
+    def set_bpm(self, bpm: float):
+        self.bpm = bpm
         # bpm * mt_per_beat is MT per minute. Divide it by 1200 to get MT
         # per GT, and multiply it by `user_speed` at last
-        self.gt += 1 / (self.bpm * self.mt_per_beat * self.user_speed / 1200)
-        self.gt_int = round(self.gt)
-        # Update last_gt_int
-        if self.gt_int > self.last_gt_int:
-            self.last_gt_int = self.gt_int
-            # New file check
-            if self.cur_chunk_size >= self.chunk_size:
-                self.new_file()
+        self.gt_per_mt = 1 / (bpm * self.mt_per_beat * self.user_speed / 1200)
 
     def new_file(self):
         self.cur_file = cmds.MCFunctionFile()
@@ -431,13 +488,19 @@ class Music(ConstExprCombined):
         self.file_sep_gt.append(self.gt_int)
         self.cur_chunk_size = 0
 
+    def flush_notes(self):
+        """Write notes of current GT to current file."""
+        if self.pending_notes:
+            self.cur_file.extend_commands(self.pending_notes)
+            self.cur_chunk_size += len(self.pending_notes)
+            self.pending_notes.clear()
+
     def is_finished(self):
-        return not any(self.tracks)
+        return not self.events
 
     def get_instrument(self, channel: int) -> str:
         """Get MC sound of channel."""
-        ins_id = self.channel_instrument[channel]
-        return self.override_instrument.get(ins_id, ID2INSTRUMENT[ins_id])
+        return self.instruments[self.channel_instrument[channel]]
 
     def get_volume(self, channel: int, velocity: int) -> float:
         """Get MC volume (0~1) according to channel and velocity."""
@@ -447,7 +510,7 @@ class Music(ConstExprCombined):
 
     def get_pitch(self, note: int) -> float:
         """Get MC pitch from MIDI note"""
-        return 2 ** ((note + self.note_offset - 54) / 12 - 1)
+        return self.pitches[note]
 
     def play_note(self, message):
         """Play a note according to note_on Message"""
@@ -456,15 +519,19 @@ class Music(ConstExprCombined):
             return
         pitch = self.get_pitch(message.note)
         sound = self.get_instrument(message.channel)
-        self.cur_file.write(cmds.Execute(
-            [cmds.ExecuteScoreMatch(self.timer.slot, str(self.gt_int)),
-             cmds.ExecuteEnv("as", self.listener_str),
-             cmds.ExecuteEnv("at", "@s")],
+        if self.note_subcmds_gt != self.gt_int:
+            self.note_subcmds_gt = self.gt_int
+            self.note_subcmds = [
+                cmds.ExecuteScoreMatch(self.timer.slot, str(self.gt_int)),
+                *self.listener_subcmds
+            ]
+        # `Execute` copies the list of subcommands
+        self.pending_notes.append(cmds.Execute(
+            self.note_subcmds,
             runs=cmds.Cmd(
                 "playsound %s @s ~ ~ ~ %.2f %.3f" % (sound, volume, pitch)
             )
         ))
-        self.cur_chunk_size += 1
 
 def acacia_build(compiler: "Compiler"):
     global mido
@@ -1,7 +1,9 @@
 """print - String formatting and printing module."""
 
-from typing import List, Optional, Tuple, TYPE_CHECKING
-from copy import deepcopy
+from typing import (
+    Dict, List, Optional, Tuple, Union, Callable, TYPE_CHECKING
+)
+from functools import lru_cache
 
 from acaciamc.objects import *
 from acaciamc.mccmdgen.expr import *
@@ -32,38 +34,88 @@ class ArgFString(axe.Multityped):
 
     def convert(self, origin: AcaciaExpr) -> "FString":
         origin = super().convert(origin)
-        if isinstance(origin, String):
-            fstr = FString([], [{"text": origin.value}])
-        else:
-            assert isinstance(origin, FString)
-            fstr = origin
-        return fstr
+        if type(origin) is String:
+            return FString([], [{"text": origin.value}])
+        assert isinstance(origin, FString)
+        return origin
 
 class _FStrError(Exception):
     def __str__(self):
         return self.args[0]
 
+# Kinds of tokens in a compiled fstring pattern
+_TOKEN_TEXT = 0  # value is the text
+_TOKEN_EXPR = 1  # value is the format id, e.g. "0" or "key"
+_TOKEN_UNCLOSED = 2  # "%{" without "}"; value is unused
+
+@lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str) -> Tuple[Tuple[int, str], ...]:
+    """Split fstring `pattern` into tokens. The result does not
+    depend on the arguments, so it is cached for patterns used again.
+    """
+    tokens = []
+    texts = []
+    def _dump_text():
+        if texts:
+            tokens.append((_TOKEN_TEXT, "".join(texts)))
+            texts.clear()
+    ptr = 0
+    while True:
+        # Normal chars: copy everything before next '%'
+        percent = pattern.find('%', ptr)
+        if percent == -1:
+            if ptr < len(pattern):
+                texts.append(pattern[ptr:])
+            break
+        if percent > ptr:
+            texts.append(pattern[ptr:percent])
+        # % format
+        second = pattern[percent + 1:percent + 2]
+        ptr = percent + 2
+        if second == '%' or not second:
+            # '%%' escape -> '%' OR '%' at the end of string
+            texts.append('%')
+            continue
+        # Parse which expression is being used here
+        if second == '{':
+            # read until }
+            end = pattern.find('}', ptr)
+            if end == -1:
+                _dump_text()
+                tokens.append((_TOKEN_UNCLOSED, ""))
+                break
+            # expr is integer or an identifier
+            name = pattern[ptr:end]
+            ptr = end + 1
+        elif second.isdecimal():
+            # %1 is the alias to %{1}
+            name = second
+        else:
+            # can't be understood, just use raw text
+            texts.append('%' + second)
+            continue
+        _dump_text()
+        tokens.append((_TOKEN_EXPR, name))
+    _dump_text()
+    return tuple(tokens)
+
 class _FStrParser:
-    def __init__(self, pattern: str, args, keywords, compiler: "Compiler"):
+    # Adders of expressions by exact type, used by `add_expr`. Filled
+    # in after `FString` is defined.
+    _ADDERS: Dict[type, Callable[["_FStrParser", AcaciaExpr], None]] = {}
+
+    def __init__(self, pattern: str, args: ARGS_T, keywords: KEYWORDS_T,
+                 compiler: "Compiler"):
         """Parse an fstring with `pattern` and `args` and `keywords`
         as formatted expressions."""
         self.pattern = pattern
-        self.ptr = 0
         self.args = args
         self.keywords = keywords
         self.compiler = compiler
-        self.dependencies = []
-        self.json = []  # the result
+        self.dependencies: CMDLIST_T = []
+        self.json: List[dict] = []  # the result
         self.text_cache: List[str] = []
 
-    def next_char(self) -> Optional[str]:
-        """Move to next char."""
-        if self.ptr >= len(self.pattern):
-            return None
-        c = self.pattern[self.ptr]
-        self.ptr += 1
-        return c
-
     def _dump_text(self):
         if self.text_cache:
             self.json.append({"text": "".join(self.text_cache)})
@@ -78,30 +130,39 @@ class _FStrParser:
             "score": {"objective": slot.objective, "name": slot.target}
         })
 
+    def _add_int_literal(self, expr: IntLiteral):
+        self.add_text(str(expr.value))
+
+    def _add_bool_literal(self, expr: BoolLiteral):
+        self.add_text('1' if expr.value else '0')
+
+    def _add_var(self, expr: Union[IntVar, BoolVar]):
+        self.add_score(expr.slot)
+
+    def _add_string(self, expr: String):
+        self.add_text(expr.value)
+
+    def _add_fstring(self, expr: "FString"):
+        self.json.extend(expr.json)
+        self.dependencies.extend(expr.dependencies)
+
     def add_expr(self, expr: AcaciaExpr):
         """Format an expression to string."""
         self._dump_text()
-        if expr.data_type.matches_cls(IntDataType):
-            if isinstance(expr, IntLiteral):
-                # optimize for literals
-                self.add_text(str(expr.value))
-            else:
-                dependencies, var = to_IntVar(expr, self.compiler)
-                self.dependencies.extend(dependencies)
-                self.add_score(var.slot)
+        # Literals, plain variables and strings, by exact type (none
+        # of these classes has subclasses)
+        adder = self._ADDERS.get(type(expr))
+        if adder is not None:
+            adder(self, expr)
+        # Other int and bool expressions are stored to a variable first
+        elif expr.data_type.matches_cls(IntDataType):
+            dependencies, var = to_IntVar(expr, self.compiler)
+            self.dependencies.extend(dependencies)
+            self.add_score(var.slot)
         elif expr.data_type.matches_cls(BoolDataType):
-            if isinstance(expr, BoolLiteral):
-                # optimize for literals
-                self.add_text('1' if expr.value else '0')
-            else:
-                dependencies, var = to_BoolVar(expr, self.compiler)
-                self.dependencies.extend(dependencies)
-                self.add_score(var.slot)
-        elif isinstance(expr, String):
-            self.add_text(expr.value)
-        elif isinstance(expr, FString):
-            self.json.extend(expr.json)
-            self.dependencies.extend(expr.dependencies)
+            dependencies, var = to_BoolVar(expr, self.compiler)
+            self.dependencies.extend(dependencies)
+            self.add_score(var.slot)
         else:
             raise _FStrError(localize("modules.print.fsrterror.addaxpr.error")% expr.data_type)
 
@@ -122,42 +183,21 @@ class _FStrParser:
         return expr
 
     def parse(self):
-        char = ''
-        while True:
-            char = self.next_char()
-            if char is None:
-                break
-            # Normal char
-            if char != '%':
-                self.add_text(char)
-                continue
-            # % format
-            second = self.next_char()
-            if second == '%' or second is None:
-                # '%%' escape -> '%' OR '%' at the end of string
-                self.add_text('%')
-                continue
-            # 1. Parse which expression is being used here
-            if second == '{':
-                # read until }
-                expr_str = []
-                expr_char = self.next_char()
-                while expr_char != '}':
-                    if expr_char is None:
-                        raise _FStrError(localize("modules.print.fsrterror.parse.unclosedfstring"))
-                    expr_str.append(expr_char)
-                    expr_char = self.next_char()
-                # expr is integer or an identifier
-                expr = self.expr_from_id(''.join(expr_str))
-            elif second.isdecimal():
-                # %1 is the alias to %{1}
-                expr = self.expr_from_id(second)
+        if '%' not in self.pattern:
+            # Plain text
+            if self.pattern:
+                self.json.append({"text": self.pattern})
+            return self.dependencies, self.json
+        add_text = self.add_text
+        add_expr = self.add_expr
+        expr_from_id = self.expr_from_id
+        for kind, value in _compile_pattern(self.pattern):
+            if kind == _TOKEN_TEXT:
+                add_text(value)
+            elif kind == _TOKEN_EXPR:
+                add_expr(expr_from_id(value))
             else:
-                # can't be understood, just use raw text
-                self.add_text(char + second)
-                continue
-            # 3. Handle the `expr` we got
-            self.add_expr(expr)
+                raise _FStrError(localize("modules.print.fsrterror.parse.unclosedfstring"))
         self._dump_text()
         return self.dependencies, self.json
 
@@ -166,11 +206,26 @@ class FStringDataType(DefaultDataType):
 
 ctdt_fstring = CTDataType("fstring")
 
+def _is_plain_text(component: dict) -> bool:
+    # `_FontComponent`s are excluded since their labels matter
+    return type(component) is dict and len(component) == 1 \
+        and "text" in component
+
+def _add_text_component(json: List[dict], text: str):
+    """Append `text` to `json`, merged into the last component if that
+    is plain text. Components are shared between fstrings, so the last
+    one is replaced instead of modified.
+    """
+    if json and _is_plain_text(json[-1]):
+        json[-1] = {"text": json[-1]["text"] + text}
+    else:
+        json.append({"text": text})
+
 class FString(ConstExprCombined):
     """A formatted string in JSON format."""
     cdata_type = ctdt_fstring
 
-    def __init__(self, dependencies: List[str], json: List[dict]):
+    def __init__(self, dependencies: CMDLIST_T, json: List[dict]):
         # dependencies: commands to run before json rawtext is used
         # json: JSON rawtext without {"rawtext": ...}
         super().__init__(FStringDataType())
@@ -178,22 +233,37 @@ class FString(ConstExprCombined):
         self.json = json
 
     def copy(self):
-        return FString(self.dependencies.copy(), deepcopy(self.json))
+        # Components are never modified in place (only whole components
+        # are added or replaced), so they can be shared between copies.
+        return FString(self.dependencies.copy(), self.json.copy())
 
     def cadd(self, other):
         # connect strings
         res = self.copy()
         if isinstance(other, String):
-            res.json.append({"text": other.value})
+            _add_text_component(res.json, other.value)
         elif isinstance(other, FString):
-            # connect json
-            res.json.extend(other.json)
+            # connect json, merging text at the boundary
+            if other.json and _is_plain_text(other.json[0]):
+                _add_text_component(res.json, other.json[0]["text"])
+                res.json.extend(other.json[1:])
+            else:
+                res.json.extend(other.json)
         else:
             unreachable()
         return res
 
     cradd = cadd
 
+_FStrParser._ADDERS.update({
+    IntLiteral: _FStrParser._add_int_literal,
+    BoolLiteral: _FStrParser._add_bool_literal,
+    IntVar: _FStrParser._add_var,
+    BoolVar: _FStrParser._add_var,
+    String: _FStrParser._add_string,
+    FString: _FStrParser._add_fstring,
+})
+
 ### Functions ###
 
 ## For creating strings
@@ -239,6 +309,17 @@ class _FontComponent(dict):
         self["text"] = text
         self.label = label
 
+# Like other components these are never modified, so the markers can
+# be shared between fstrings.
+_FONT_END = _FontComponent("\xA7r", "end")
+_font_starts: Dict[str, _FontComponent] = {}
+
+def _font_start(fmt_code: str) -> _FontComponent:
+    res = _font_starts.get(fmt_code)
+    if res is None:
+        res = _font_starts[fmt_code] = _FontComponent(fmt_code, "start")
+    return res
+
 COLOR_DEFAULT = "default"
 
 @axe.chop
@@ -306,11 +387,17 @@ def _with_font(compiler: "Compiler", text: FString, color: str,
         raise ValueError(localize("modules.print.withfont.unclosedfont"))
     if start_i != -1:
         scopes.append((start_i, json_len))
-    scopes.reverse()
-    fmt_code = "".join(fmts)
+    font_start = _font_start("".join(fmts))
+    json = []
+    last_end = 0
     for start_i, end_i in scopes:
-        res.json.insert(end_i, _FontComponent("\xA7r", "end"))
-        res.json.insert(start_i, _FontComponent(fmt_code, "start"))
+        json.extend(res.json[last_end:start_i])
+        json.append(font_start)
+        json.extend(res.json[start_i:end_i])
+        json.append(_FONT_END)
+        last_end = end_i
+    json.extend(res.json[last_end:])
+    res.json = json
     return res
 
 ## For printing
@@ -370,8 +457,9 @@ def _title(compiler, text: FString, target: Optional["MCSelector"], mode: str,
     # Start
     ## set config
     conf = (fade_in, stay_time, fade_out)
-    if conf != _DEF_TITLE_CONFIG:
-        # only set config when it's not the default one
+    # only set and reset config when it's not the default one
+    custom_conf = conf != _DEF_TITLE_CONFIG
+    if custom_conf:
         commands.append(cmds.TitlerawTimes(target_str, *conf))
     ## titleraw
     commands.extend(text.dependencies)
@@ -379,8 +467,7 @@ def _title(compiler, text: FString, target: Optional["MCSelector"], mode: str,
         cmds.RawtextOutput('titleraw %s %s' % (target_str, mode), text.json)
     )
     ## reset config
-    if conf != _DEF_TITLE_CONFIG:
-        # only reset when config is not the default one
+    if custom_conf:
         commands.append(cmds.TitlerawResetTimes(target_str))
     ## return
     return resultlib.commands(commands)
@@ -3,6 +3,7 @@
 __all__ = ['EntityDataType', 'TaggedEntity', 'EntityReference']
 
 from typing import TYPE_CHECKING, List, Optional
+import sys
 
 from acaciamc.error import *
 from acaciamc.mccmdgen.mcselector import MCSelector
@@ -34,9 +35,11 @@ class EntityDataType(Storable):
         return TaggedEntity.new_tag(self.template, compiler)
 
 class _EntityBase(AcaciaExpr):
+    __slots__ = ("template", "cast_template")
+
     def __init__(self, template: "EntityTemplate",
                  cast_to: Optional["EntityTemplate"] = None):
-        super().__init__(EntityDataType(template))
+        super().__init__(template.entity_data_type)
         self.cast_template = cast_to
         self.template = template
         self.template.register_entity(self)
@@ -64,11 +67,11 @@ class _EntityBase(AcaciaExpr):
         raise NotImplementedError
 
     def export(self, var: "TaggedEntity", compiler):
-        cmds = var.clear()
-        cmds.append("tag %s add %s" % (self, var.tag))
-        return cmds
+        return [var._clear_cmd, f"tag {self.to_str()} add {var.tag}"]
 
 class EntityReference(_EntityBase):
+    __slots__ = ("selector",)
+
     def __init__(self, selector: MCSelector, template: "EntityTemplate",
                  cast_to: Optional["EntityTemplate"] = None):
         self.selector = selector
@@ -85,10 +88,21 @@ class EntityReference(_EntityBase):
         return EntityReference(self.selector, self.template, template)
 
 class TaggedEntity(_EntityBase, VarValue):
+    __slots__ = ("tag", "_selector_str", "_clear_cmd", "is_temporary")
+
     def __init__(self, tag: str, template: "EntityTemplate",
                  cast_to: Optional["EntityTemplate"] = None):
         self.tag = tag
-        super().__init__(template, cast_to)
+        # The slot hides `VarValue.is_temporary`, so set it explicitly
+        self.is_temporary = False
+        # The selector of a tagged entity never changes, so its string
+        # form and the command that clears the tag are built once.
+        self._selector_str = sys.intern(self.get_selector().to_str())
+        self._clear_cmd = f"tag {self._selector_str} remove {tag}"
+        _EntityBase.__init__(self, template, cast_to)
+
+    def to_str(self) -> str:
+        return self._selector_str
 
     def cast_to(self, template):
         return TaggedEntity(self.tag, self.template, template)
@@ -109,4 +123,4 @@ class TaggedEntity(_EntityBase, VarValue):
 
     def clear(self) -> List[str]:
         # Clear the reference to entity that the tag is pointing to.
-        return ["tag %s remove %s" % (self, self.tag)]
+        return [self._clear_cmd]
@@ -12,7 +12,7 @@ from acaciamc.mccmdgen.utils import InvalidOpError
 import acaciamc.mccmdgen.cmds as cmds
 from .entity_template import ETemplateDataType
 from .entity_filter import EFilterDataType
-from .entity import EntityDataType, EntityReference
+from .entity import EntityReference
 from .boolean import WildBool
 from .integer import IntOpGroup, IntOp
 from .functions import BinaryFunction, ConstructorFunction
@@ -75,7 +75,7 @@ class EGroupType(ConstExprCombined, ConstructorFunction):
         return c
 
     def datatype_hook(self):
-        return EGroupDataType(self.template)
+        return self.template.group_data_type
 
 class IntEntityCount(IntOp):
     init = True
@@ -98,8 +98,8 @@ class EntityGroup(VarValue):
         self.template = data_type.template
         self.tag = compiler.allocate_entity_tag()
         SELF = self.get_selector().to_str()
-        MEMBER_TYPE = EntityDataType(self.template)
-        OPERAND_TYPE = EGroupDataType(self.template)
+        MEMBER_TYPE = self.template.entity_data_type
+        OPERAND_TYPE = self.template.group_data_type
 
         @method_of(self, "select")
         @axe.chop
@@ -110,7 +110,7 @@ class EntityGroup(VarValue):
             Selects entities from all entities in the world that match
             the filter and add them to this entity group.
             """
-            cmds = filter_.dump("tag {selected} add %s" % self.tag)
+            cmds = filter_.dump(f"tag {{selected}} add {self.tag}")
             return self, cmds
         @method_of(self, "drop")
         @axe.chop
@@ -122,7 +122,7 @@ class EntityGroup(VarValue):
             filter and remove them.
             """
             cmds = filter_.dump(
-                "tag {selected} remove %s" % self.tag,
+                f"tag {{selected}} remove {self.tag}",
                 among_tag=self.tag
             )
             return self, cmds
@@ -137,29 +137,27 @@ class EntityGroup(VarValue):
             """
             tmp = compiler.allocate_entity_tag()
             cmds = filter_.dump(
-                "tag {selected} add %s" % tmp,
+                f"tag {{selected}} add {tmp}",
                 among_tag=self.tag
             )
-            cmds.append("tag @e[tag={0},tag=!{1}] remove {0}".format(
-                self.tag, tmp
-            ))
-            cmds.append("tag @e[tag={0}] remove {0}".format(tmp))
+            cmds.append(f"tag @e[tag={self.tag},tag=!{tmp}] remove {self.tag}")
+            cmds.append(f"tag @e[tag={tmp}] remove {tmp}")
             return self, cmds
         @method_of(self, "extend")
         @axe.chop
         @axe.arg("other", OPERAND_TYPE)
         def _extend(compiler, other: "EntityGroup"):
-            return self, ["tag @e[tag=%s] add %s" % (other.tag, self.tag)]
+            return self, self._extend_cmds(other)
         @method_of(self, "subtract")
         @axe.chop
         @axe.arg("other", OPERAND_TYPE)
         def _subtract(compiler, other: "EntityGroup"):
-            return self, ["tag @e[tag=%s] remove %s" % (other.tag, self.tag)]
+            return self, self._subtract_cmds(other)
         @method_of(self, "intersect")
         @axe.chop
         @axe.arg("other", OPERAND_TYPE)
         def _intersect(compiler, other: "EntityGroup"):
-            return self, ["tag @e[tag=!%s] remove %s" % (other.tag, self.tag)]
+            return self, [f"tag @e[tag=!{other.tag}] remove {self.tag}"]
         @method_of(self, "copy")
         @axe.chop
         def _copy(compiler):
@@ -168,19 +166,19 @@ class EntityGroup(VarValue):
         @method_of(self, "clear")
         @axe.chop
         def _clear(compiler):
-            return self, ["tag %s remove %s" % (SELF, self.tag)]
+            return self, [f"tag {SELF} remove {self.tag}"]
         @method_of(self, "add")
         @axe.chop
         @axe.star_arg("entities", MEMBER_TYPE)
         def _add(compiler, entities: List["_EntityBase"]):
-            return self, ["tag %s add %s" % (entity, self.tag)
-                          for entity in entities]
+            suffix = f" add {self.tag}"
+            return self, [f"tag {entity}{suffix}" for entity in entities]
         @method_of(self, "remove")
         @axe.chop
         @axe.star_arg("entities", MEMBER_TYPE)
         def _remove(compiler, entities: List["_EntityBase"]):
-            return self, ["tag %s remove %s" % (entity, self.tag)
-                          for entity in entities]
+            suffix = f" remove {self.tag}"
+            return self, [f"tag {entity}{suffix}" for entity in entities]
         @method_of(self, "is_empty")
         @axe.chop
         def _is_empty(compiler: "Compiler"):
@@ -206,11 +204,15 @@ class EntityGroup(VarValue):
 
     @classmethod
     def from_template(cls, template: "EntityTemplate", compiler: "Compiler"):
-        return cls(EGroupDataType(template), compiler)
+        return cls(template.group_data_type, compiler)
 
     def export(self, var: "EntityGroup", compiler) -> CMDLIST_T:
+        if var.tag == self.tag:
+            # Assigning a group to itself; clearing `var` first would
+            # empty the group.
+            return []
         commands = var.clear()
-        commands.append("tag @e[tag=%s] add %s" % (self.tag, var.tag))
+        commands.append(f"tag @e[tag={self.tag}] add {var.tag}")
         return commands
 
     def get_selector(self) -> "MCSelector":
@@ -219,10 +221,21 @@ class EntityGroup(VarValue):
         return res
 
     def clear(self) -> CMDLIST_T:
-        return ["tag @e[tag={0}] remove {0}".format(self.tag)]
+        return [f"tag @e[tag={self.tag}] remove {self.tag}"]
+
+    def _extend_cmds(self, other: "EntityGroup") -> CMDLIST_T:
+        if other.tag == self.tag:
+            return []  # extending a group with itself
+        return [f"tag @e[tag={other.tag}] add {self.tag}"]
+
+    def _subtract_cmds(self, other: "EntityGroup") -> CMDLIST_T:
+        return [f"tag @e[tag={other.tag}] remove {self.tag}"]
 
     def iadd(self, other, compiler):
         if isinstance(other, EntityGroup):
+            if other.template.is_subtemplate_of(self.template):
+                # Type already checked, skip `extend`'s argument parsing
+                return self._extend_cmds(other)
             expr, cmds = self.attribute_table.lookup("extend").call(
                 [other], {}, compiler
             )
@@ -232,6 +245,9 @@ class EntityGroup(VarValue):
 
     def isub(self, other, compiler):
         if isinstance(other, EntityGroup):
+            if other.template.is_subtemplate_of(self.template):
+                # Type already checked, skip `subtract`'s argument parsing
+                return self._subtract_cmds(other)
             expr, cmds = self.attribute_table.lookup("subtract").call(
                 [other], {}, compiler
             )
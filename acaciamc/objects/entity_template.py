@@ -26,11 +26,10 @@ __all__ = [
 from typing import (
     List, Tuple, Dict, Union, Optional, Callable, NamedTuple, TYPE_CHECKING
 )
-from itertools import chain
 
 from acaciamc.ast import MethodQualifier
 from acaciamc.error import *
-from acaciamc.tools import axe, resultlib
+from acaciamc.tools import axe
 from acaciamc.mccmdgen import cmds
 from acaciamc.mccmdgen.datatype import DefaultDataType, Storable
 from acaciamc.mccmdgen.ctexpr import CTDataType
@@ -38,8 +37,7 @@ from acaciamc.mccmdgen.expr import *
 from acaciamc.mccmdgen.utils import unreachable
 from .entity import TaggedEntity, EntityDataType
 from .functions import (
-    BoundVirtualMethod, BoundMethod, InlineFunction, ConstructorFunction,
-    BinaryFunction
+    BoundVirtualMethod, BoundMethod, InlineFunction, ConstructorFunction
 )
 from .position import PosDataType
 from .none import NoneDataType
@@ -124,19 +122,22 @@ class _MethodDispatcher:
                 res.add_implementation(template, impl, get_self_var)
         return res
 
-    def bind_to_cast(self, entity: "_EntityBase"):
-        best = None
-        mro = entity.cast_template.mro_
-        for impl, (templates, get_self_var) in self.impls.items():
-            try:
-                i = mro.index(templates[0])
-            except ValueError:
-                pass
-            else:
-                if best is None or i < best[0]:
-                    best = i, impl, get_self_var
-        _, impl, get_self_var = best
-        return BoundMethod(entity, self.method_name, impl, get_self_var)
+    def resolve_cast(self, cast_template: "EntityTemplate") \
+            -> Tuple["METHODDEF_T", Optional[Callable[[], TaggedEntity]]]:
+        """Return the implementation (and its self var getter) used by
+        entities casted to `cast_template`.
+        """
+        # Use the implementation of the template that comes first
+        # in MRO of `cast_template`.
+        owners = {
+            templates[0]: (impl, get_self_var)
+            for impl, (templates, get_self_var) in self.impls.items()
+        }
+        for template in cast_template.mro_:
+            res = owners.get(template)
+            if res is not None:
+                return res
+        unreachable("No implementation found")
 
 class _SimpleMethod:
     """Non-virtual and non-override methods."""
@@ -175,51 +176,48 @@ def _check_override(implementation: "METHODDEF_T", method: str):
             raise Error(ErrorType.OVERRIDE_RESULT_UNSTORABLE,
                         name=method, type_=str(res_type))
 
+@axe.chop
+@axe.arg("type", axe.Nullable(axe.LiteralString()),
+        rename="type_", default=None)
+@axe.arg("pos", axe.Nullable(axe.Typed(PosDataType)), default=None)
+@axe.arg("name", axe.Nullable(axe.LiteralString()), default=None)
+@axe.arg("event", axe.Nullable(axe.LiteralString()), default=None)
+def _entity_new_args(
+    compiler: "Compiler", type_: Optional[str], pos: Optional["Position"],
+    name: Optional[str], event: Optional[str]
+):
+    # The parser is built once here and shared by every `new` call.
+    return type_, pos, name, event
+
 def default_entity_new(
     compiler, template_id: AcaciaExpr, tag: str, args, keywords
 ):
-    @axe.chop
-    @axe.arg("type", axe.Nullable(axe.LiteralString()),
-            rename="type_", default=None)
-    @axe.arg("pos", axe.Nullable(axe.Typed(PosDataType)), default=None)
-    @axe.arg("name", axe.Nullable(axe.LiteralString()), default=None)
-    @axe.arg("event", axe.Nullable(axe.LiteralString()), default=None)
-    def new_entity(
-        compiler: "Compiler", type_: Optional[str], pos: Optional["Position"],
-        name: Optional[str], event: Optional[str]
-    ):
-        e_type = compiler.cfg.entity_type
+    type_, pos, name, event = _entity_new_args(compiler, args, keywords)
+    e_type = compiler.cfg.entity_type if type_ is None else type_
+    if pos is None:
         e_pos = ([], compiler.cfg.entity_pos)
-        e_event = "*"
-        e_name = ""
-        e_rot = " 0 0" if compiler.cfg.mc_version >= (1, 19, 70) else ""
-        if type_ is not None:
-            e_type = type_
-        if pos is not None:
-            e_pos = (pos.context, "~ ~ ~")
-        if event is not None:
-            e_event = event
-        if name is not None:
-            e_name = f" {cmds.mc_str(name)}"
-        return resultlib.commands([
-            cmds.Execute(
-                [cmds.ExecuteEnv("at", SUMMON_AT)],
-                f"summon {e_type} ~ {SUMMON_Y} ~{e_rot} {e_event}{e_name}"
-            ),
-            cmds.Execute(
-                [cmds.ExecuteEnv("at", SUMMON_AT)],
-                f"tag @e[x=~,y={SUMMON_Y},z=~,dx=0,dy=0,dz=0] add {tag}"
-            ),
-            cmds.Execute(e_pos[0], f"tp @e[tag={tag}] {e_pos[1]}"),
-            *template_id.export(
-                IntVar(cmds.ScbSlot(
-                    f"@e[tag={tag}]", compiler.etemplate_id_scb
-                )),
-                compiler
-            )
-        ])
-    _, commands = BinaryFunction(new_entity).call(args, keywords, compiler)
-    return commands
+    else:
+        e_pos = (pos.context, "~ ~ ~")
+    e_event = "*" if event is None else event
+    e_name = "" if name is None else f" {cmds.mc_str(name)}"
+    e_rot = " 0 0" if compiler.cfg.mc_version >= (1, 19, 70) else ""
+    return [
+        cmds.Execute(
+            [cmds.ExecuteEnv("at", SUMMON_AT)],
+            f"summon {e_type} ~ {SUMMON_Y} ~{e_rot} {e_event}{e_name}"
+        ),
+        cmds.Execute(
+            [cmds.ExecuteEnv("at", SUMMON_AT)],
+            f"tag @e[x=~,y={SUMMON_Y},z=~,dx=0,dy=0,dz=0] add {tag}"
+        ),
+        cmds.Execute(e_pos[0], f"tp @e[tag={tag}] {e_pos[1]}"),
+        *template_id.export(
+            IntVar(cmds.ScbSlot(
+                f"@e[tag={tag}]", compiler.etemplate_id_scb
+            )),
+            compiler
+        )
+    ]
 
 def get_deleted_entity_new(template_name: str):
     def _res(compiler, template_id: AcaciaExpr, tag: str, args, keywords):
@@ -256,6 +254,11 @@ class EntityTemplate(ConstExprCombined, ConstructorFunction):
         super().__init__(ETemplateDataType())
         self.name = name
         self.func_repr = self.name
+        # Types of entities and entity groups of this template, shared
+        # by all of them
+        from .entity_group import EGroupDataType
+        self.entity_data_type = EntityDataType(self)
+        self.group_data_type = EGroupDataType(self)
         if source is not None:
             self.source = source
         self.parents = parents
@@ -266,6 +269,12 @@ class EntityTemplate(ConstExprCombined, ConstructorFunction):
         self.simple_methods: Dict[str, _SimpleMethod] = {}
         self.static_methods: Dict[str, AcaciaCallable] = {}
         self.mro_: List[EntityTemplate] = [self]  # Method Resolution Order
+        # Virtual methods resolved for entities casted to this template
+        # (see `register_entity`). Templates created later are never in
+        # our MRO, so this does not change once computed.
+        self._cast_methods: Optional[List[Tuple[
+            str, "METHODDEF_T", Optional[Callable[[], TaggedEntity]]
+        ]]] = None
         # Runtime identification number
         # Mark which template an entity is using at runtime.
         # All entities managed by Acacia have a id on scoreboard
@@ -274,43 +283,45 @@ class EntityTemplate(ConstExprCombined, ConstructorFunction):
         # of this template.
         self.runtime_id = compiler.allocate_etemplate_id()
         ## MRO: We use the same C3 algorithm as Python.
-        merge: List[List[EntityTemplate]] = []
-        for parent in self.parents:
-            if parent.mro_:
-                merge.append(parent.mro_.copy())
+        # Lists are never modified; `heads[i]` is the index of the
+        # current head of `merge[i]` and `positions[i]` maps templates
+        # to their index in `merge[i]`.
+        merge: List[List[EntityTemplate]] = [
+            parent.mro_ for parent in self.parents if parent.mro_
+        ]
         if self.parents:
-            merge.append(self.parents.copy())
-        while merge:
-            for ts in merge.copy():
-                candidate = ts[0]
-                for ts2 in merge:
-                    if candidate in ts2[1:]:
-                        break
+            merge.append(self.parents)
+        heads = [0] * len(merge)
+        positions = [{t: i for i, t in enumerate(ts)} for ts in merge]
+        remaining = list(range(len(merge)))
+        while remaining:
+            for i in remaining:
+                candidate = merge[i][heads[i]]
+                for j in remaining:
+                    if positions[j].get(candidate, -1) > heads[j]:
+                        break  # `candidate` is in tail of `merge[j]`
                 else:
                     self.mro_.append(candidate)
-                    for ts3 in merge.copy():
-                        if candidate in ts3:
-                            ts3.remove(candidate)
-                            if not ts3:
-                                merge.remove(ts3)
+                    for j in remaining:
+                        if merge[j][heads[j]] is candidate:
+                            heads[j] += 1
+                    remaining = [
+                        j for j in remaining if heads[j] < len(merge[j])
+                    ]
                     break
             else:
                 raise Error(ErrorType.MRO)
-        ## Check attribute name conlicts
-        # Attributes may appear only once
-        attr_list = list(chain(
-            field_types,
-            chain.from_iterable(t.field_types for t in parents)
-        ))
-        seen = set()
-        for attr in attr_list:
-            if attr in seen:
-                raise Error(ErrorType.EFIELD_MULTIPLE_DEFS, attr=attr)
-            else:
-                seen.add(attr)
+        self._mro_set = frozenset(self.mro_)
         ## Inherit attributes
+        # Attributes may appear only once
+        seen = set(field_types)
         for parent in parents:
-            self.field_types.update(parent.field_types)
+            parent_fields = parent.field_types
+            if not seen.isdisjoint(parent_fields):
+                attr = next(a for a in parent_fields if a in seen)
+                raise Error(ErrorType.EFIELD_MULTIPLE_DEFS, attr=attr)
+            seen.update(parent_fields)
+            self.field_types.update(parent_fields)
             self.field_metas.update(parent.field_metas)
         ## Check method name conflicts
         # Methods can appear multiple times, but all override/virtual
@@ -338,7 +349,7 @@ class EntityTemplate(ConstExprCombined, ConstructorFunction):
                 _check(m_virtual, m_simple, method)
                 m_static[method] = impl
         ## Make sure field names do not conflict with method names
-        for attr in attr_list:
+        for attr in self.field_types:
             if attr in m_virtual or attr in m_simple or attr in m_static:
                 raise Error(ErrorType.METHOD_ATTR_CONFLICT, name=attr)
         ## Handle methods
@@ -446,36 +457,40 @@ class EntityTemplate(ConstExprCombined, ConstructorFunction):
             self.attribute_table.set(name, impl)
 
     def datatype_hook(self):
-        return EntityDataType(self)
+        return self.entity_data_type
 
     def register_entity(self, entity: "_EntityBase"):
         # Register attributes to and initialize an entity
         # whose template is self.
         # Every entities MUST call their template's `register_entity`
         assert entity.template is self
+        set_attr = entity.attribute_table.set
         # Convert stored virtual methods into bound method of `entity`.
-        if entity.cast_template is None:
-            for name, disp in self.method_dispatchers.items():
-                entity.attribute_table.set(name, disp.bind_to(entity))
-        else:
-            for name, disp in entity.cast_template.method_dispatchers.items():
-                entity.attribute_table.set(name, disp.bind_to_cast(entity))
-        # Convert stored simple methods into bound method of `entity`.
         if entity.cast_template is None:
             template = self
+            for name, disp in self.method_dispatchers.items():
+                set_attr(name, disp.bind_to(entity))
         else:
             template = entity.cast_template
+            cast_methods = template._cast_methods
+            if cast_methods is None:
+                cast_methods = template._cast_methods = [
+                    (name, *disp.resolve_cast(template))
+                    for name, disp in template.method_dispatchers.items()
+                ]
+            for name, impl, get_self_var in cast_methods:
+                set_attr(name,
+                         BoundMethod(entity, name, impl, get_self_var))
+        # Convert stored simple methods into bound method of `entity`.
         for name, mgr in template.simple_methods.items():
-            entity.attribute_table.set(name, mgr.bind_to(entity))
+            set_attr(name, mgr.bind_to(entity))
         # Convert stored fields to attributes of `entity`.
+        field_types = self.field_types
         for name, meta in self.field_metas.items():
-            type_ = self.field_types[name]
-            entity.attribute_table.set(
-                name, type_.new_var_as_field(entity, **meta)
-            )
+            set_attr(name, field_types[name].new_var_as_field(entity, **meta))
         # Add static methods
         for name, impl in template.static_methods.items():
-            entity.attribute_table.set(name, impl)
+            set_attr(name, impl)
 
     def initialize(self, instance: "TaggedEntity", compiler: "Compiler",
                    args, keywords):
@@ -494,9 +509,4 @@ class EntityTemplate(ConstExprCombined, ConstructorFunction):
     def is_subtemplate_of(self, other: "EntityTemplate") -> bool:
         # Return whether `self` is a subtemplate of `other`. A
         # template itself is considered as a subtemplate of itself.
-        if self is other:
-            return True
-        for parent in self.parents:
-            if parent.is_subtemplate_of(other):
-                return True
-        return False
+        return other in self._mro_set
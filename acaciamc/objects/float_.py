@@ -2,7 +2,7 @@
 
 __all__ = ["FloatDataType", "Float"]
 
-from functools import partialmethod
+import operator
 
 from acaciamc.mccmdgen.datatype import DefaultDataType
 from acaciamc.error import Error, ErrorType
@@ -16,7 +16,25 @@ class FloatDataType(DefaultDataType):
 
 ctdt_float = CTDataType("float")
 
+def _bin_op(op, reverse=False):
+    """`op`: `operator.add`, `operator.sub`, etc.
+    `reverse`: whether `other` is the left operand.
+    """
+    def _method(self: "Float", other):
+        if isinstance(other, (Float, IntLiteral)):
+            try:
+                if reverse:
+                    v = op(other.value, self.value)
+                else:
+                    v = op(self.value, other.value)
+            except ArithmeticError as err:
+                raise Error(ErrorType.CONST_ARITHMETIC, message=str(err))
+            return Float(v)
+        raise InvalidOpError
+    return _method
+
 class Float(ConstExprCombined):
+    __slots__ = ("value",)
     cdata_type = ctdt_float
 
     def __init__(self, value: float):
@@ -42,23 +60,13 @@ class Float(ConstExprCombined):
     def cunaryneg(self):
         return Float(-self.value)
 
-    def _bin_op(self, other, method: str):
-        """`method`: "__add__", "__sub__", etc."""
-        if isinstance(other, (Float, IntLiteral)):
-            try:
-                v = getattr(self.value, method)(other.value)
-            except ArithmeticError as err:
-                raise Error(ErrorType.CONST_ARITHMETIC, message=str(err))
-            return Float(v)
-        raise InvalidOpError
-
-    cadd = partialmethod(_bin_op, method="__add__")
-    csub = partialmethod(_bin_op, method="__sub__")
-    cmul = partialmethod(_bin_op, method="__mul__")
-    cdiv = partialmethod(_bin_op, method="__truediv__")
-    cmod = partialmethod(_bin_op, method="__mod__")
-    cradd = partialmethod(_bin_op, method="__radd__")
-    crsub = partialmethod(_bin_op, method="__rsub__")
-    crmul = partialmethod(_bin_op, method="__rmul__")
-    crdiv = partialmethod(_bin_op, method="__rtruediv__")
-    crmod = partialmethod(_bin_op, method="__rmod__")
+    cadd = _bin_op(operator.add)
+    csub = _bin_op(operator.sub)
+    cmul = _bin_op(operator.mul)
+    cdiv = _bin_op(operator.truediv)
+    cmod = _bin_op(operator.mod)
+    cradd = _bin_op(operator.add, reverse=True)
+    crsub = _bin_op(operator.sub, reverse=True)
+    crmul = _bin_op(operator.mul, reverse=True)
+    crdiv = _bin_op(operator.truediv, reverse=True)
+    crmod = _bin_op(operator.mod, reverse=True)
@@ -82,6 +82,9 @@ T = TypeVar("T")
 DT = TypeVar("DT")
 IT = TypeVar("IT")
 
+_NO_DEFAULT = object()
+_UNSET = object()
+
 class ArgumentHandler(Generic[IT, T, DT]):
     """A tool to match function arguments against a given definition."""
     def __init__(self, args: List[str], arg_types: Dict[str, Optional[DT]],
@@ -91,13 +94,21 @@ class ArgumentHandler(Generic[IT, T, DT]):
         """
         self.args = args
         self.arg_types = arg_types
-        self.arg_defaults = arg_defaults
         # Throw away arguments that have no default value in
         # `arg_defaults`.
-        for arg, value in self.arg_defaults.copy().items():
-            if value is None:
-                del self.arg_defaults[arg]
+        self.arg_defaults = {
+            arg: value for arg, value in arg_defaults.items()
+            if value is not None
+        }
         self.ARG_LEN = len(self.args)
+        # The pattern never changes, so these are prepared here to
+        # save lookups in `match`.
+        self._arg_index = {arg: i for i, arg in enumerate(self.args)}
+        self._arg_types = tuple(self.arg_types[arg] for arg in self.args)
+        self._arg_defaults = tuple(
+            (arg, self.arg_defaults.get(arg, _NO_DEFAULT))
+            for arg in self.args
+        )
 
     def preconvert(self, arg: str, value: IT) -> T:
         # Can be omitted if `IT` is same as `T`.
@@ -116,29 +127,42 @@ class ArgumentHandler(Generic[IT, T, DT]):
         """
         if len(args) > self.ARG_LEN:
             raise Error(ErrorType.TOO_MANY_ARGS)
-        res = dict.fromkeys(self.args)
+        names = self.args
+        types = self._arg_types
+        # Fast path: every argument is given positionally
+        if not keywords and len(args) == self.ARG_LEN:
+            res = {}
+            for arg, type_, value in zip(names, types, args):
+                value = self.preconvert(arg, value)
+                self.__type_check(arg, value, type_)
+                res[arg] = value
+            return res
+        values = [_UNSET] * self.ARG_LEN
         # positioned
         for i, value in enumerate(args):
-            arg = self.args[i]
+            arg = names[i]
             value = self.preconvert(arg, value)
-            self.__type_check(arg, value, self.arg_types[arg])
-            res[arg] = value
+            self.__type_check(arg, value, types[i])
+            values[i] = value
         # keyword
+        arg_index = self._arg_index
         for arg, value in keywords.items():
-            if arg not in self.args:
+            i = arg_index.get(arg)
+            if i is None:
                 raise Error(ErrorType.UNEXPECTED_KEYWORD_ARG, arg=arg)
-            if res[arg] is not None:
+            if values[i] is not _UNSET:
                 raise Error(ErrorType.ARG_MULTIPLE_VALUES, arg=arg)
             value = self.preconvert(arg, value)
-            self.__type_check(arg, value, self.arg_types[arg])
-            res[arg] = value
+            self.__type_check(arg, value, types[i])
+            values[i] = value
         # if any args are missing use default if exists, else error
-        for arg, value in res.copy().items():
-            if value is None:
-                if arg in self.arg_defaults:
-                    res[arg] = self.arg_defaults[arg]
-                else:
+        res = {}
+        for (arg, default), value in zip(self._arg_defaults, values):
+            if value is _UNSET:
+                if default is _NO_DEFAULT:
                     raise Error(ErrorType.MISSING_ARG, arg=arg)
+                value = default
+            res[arg] = value
         return res
 
 class AcaciaArgHandler(ArgumentHandler[AcaciaExpr, AcaciaExpr, "DataType"]):
@@ -191,6 +191,7 @@ class IntLiteral(ConstExprCombined):
     which calculate the value of constant expressions
     in compile time (e.g. compiler can convert "2 + 3" to "5").
     """
+    __slots__ = ("value",)
     cdata_type = ctdt_int
 
     def __init__(self, value: int):
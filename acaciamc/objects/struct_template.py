@@ -3,6 +3,7 @@
 __all__ = ["StructTemplateDataType", "StructTemplate"]
 
 from typing import List, Dict, Optional, TYPE_CHECKING
+from itertools import chain
 
 from .struct import StructDataType, Struct
 from .functions import ConstructorFunction, BinaryFunction
@@ -32,6 +33,10 @@ class StructTemplate(ConstExprCombined, ConstructorFunction):
         self.field_types = field
         self.func_repr = name
         self.source = source
+        # All templates this is a sub-template of (including itself)
+        self._ancestors = frozenset(chain(
+            (self,), chain.from_iterable(base._ancestors for base in bases)
+        ))
         # Merge attributes from ancestors.
         for base in bases:
             for name, type_ in base.field_types.items():
@@ -46,11 +51,7 @@ class StructTemplate(ConstExprCombined, ConstructorFunction):
         """Return whether `template` is sub-template of this.
         This itself is treated as its own sub-template.
         """
-        if template is self:
-            return True
-        if template in self.bases:
-            return True
-        return any(base.is_subtemplate_of(template) for base in self.bases)
+        return template in self._ancestors
 
     def initialize(
         self, instance: "Struct", compiler,
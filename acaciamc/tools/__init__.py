@@ -1,8 +1,10 @@
 """Acacia tools for creating binary modules."""
 
-__all__ = ["method_of", "cmethod_of", "ImmutableMixin", "transform_immutable"]
+__all__ = ["method_of", "cmethod_of", "ImmutableMixin", "transform_immutable",
+           "transform_unbound"]
 
 from typing import Callable as _Callable, Union as _Union
+from functools import partial as _partial
 
 # `import acaciamc.objects as objects` won't work in 3.6
 # because of a Python bug (see https://bugs.python.org/issue23203)
@@ -57,7 +59,15 @@ def transform_immutable(self: ImmutableMixin):
     if not isinstance(self, ImmutableMixin):
         raise TypeError(localize("tools.init.transformimmutable"))
     def _decorator(func: _Callable):
-        def _decorated(*args, **kwds):
-            return func(self.copy(), *args, **kwds)
-        return _decorated
+        return _partial(_call_with_copy, func, self)
     return _decorator
+
+def transform_unbound(func: _Callable):
+    """Like `transform_immutable`, but for implementations shared by
+    many objects: the object to copy is given as the first argument
+    when called.
+    """
+    return _partial(_call_with_copy, func)
+
+def _call_with_copy(func: _Callable, self, *args, **kwds):
+    return func(self.copy(), *args, **kwds)
@@ -571,6 +571,7 @@ class LiteralIntEnum(LiteralInt):
     def __init__(self, *accepts: int):
         super().__init__()
         self.accepts = accepts
+        self.accept_set = frozenset(accepts)
 
     def get_show_name(self) -> str:
         return (super().get_show_name()
@@ -578,7 +579,7 @@ class LiteralIntEnum(LiteralInt):
 
     def uconvert(self, origin) -> int:
         origin_int = super().uconvert(origin)
-        if origin_int not in self.accepts:
+        if origin_int not in self.accept_set:
             self.wrong_argument()
         return origin_int
 
@@ -589,6 +590,7 @@ class LiteralStringEnum(LiteralString):
     def __init__(self, *accepts: str):
         super().__init__()
         self.accepts = accepts
+        self.accept_set = frozenset(accepts)
 
     def get_show_name(self) -> str:
         return (super().get_show_name()
@@ -596,7 +598,7 @@ class LiteralStringEnum(LiteralString):
 
     def uconvert(self, origin) -> str:
         origin_str = super().uconvert(origin)
-        if origin_str not in self.accepts:
+        if origin_str not in self.accept_set:
             self.wrong_argument()
         return origin_str
 
@@ -865,7 +867,12 @@ class _Chopper:
             )
 
     def __call__(self, compiler: "Compiler", args: List[_EXPR_T],
-                 kwds: Dict[str, _EXPR_T]):
+                 kwds: Dict[str, _EXPR_T], bound: tuple = ()):
+        """Parse the arguments and call the implementation.
+        `bound` are passed to the implementation before `compiler`,
+        which allows one parser to be shared by methods of many
+        objects.
+        """
         res: Dict[str, Any] = {}
         res_positional: List[Any] = []
         arg_got: List[str] = []
@@ -936,7 +943,7 @@ class _Chopper:
         if self.kwds and self.kwds.name not in arg_got:
             _emit(self.kwds, {})
         return _call_impl(self.implementation, arg_got,
-                          compiler, *res_positional, **res)
+                          *bound, compiler, *res_positional, **res)
 
 def _create_signature(arg_defs: List[_Argument]) -> str:
     return "(%s)" % ", ".join(
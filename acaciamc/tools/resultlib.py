@@ -23,8 +23,12 @@ class Result(NamedTuple):
     value: "AcaciaExpr"
     commands: "CMDLIST_T"
 
+# `NoneLiteral` carries no state, so every command-only result can
+# share one instance.
+_NONE = objects.NoneLiteral()
+
 def commands(cmds: "CMDLIST_T") -> Result:
-    return Result(objects.NoneLiteral(), cmds)
+    return Result(_NONE, cmds)
 
 def literal(value: Union[bool, int, str, float, None]) -> "AcaciaExpr":
     if isinstance(value, bool):  # `bool` in front of `int`